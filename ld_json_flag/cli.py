@@ -4,7 +4,6 @@
 import os
 import sys
 import argparse
-from dotenv import load_dotenv
 
 from ld_json_flag.client import LaunchDarklyClient
 from ld_json_flag.interactive import (
@@ -15,29 +14,23 @@ from ld_json_flag.interactive import (
 )
 
 
-def parse_arguments():
+def load_dotenv_file():
     """
-    Parse command line arguments.
+    Load environment variables from the nearest .env file.
+
+    python-dotenv is imported here so runs that never reach main() skip it.
+    As with load_dotenv, variables already set in the environment win.
 
     Returns:
-        argparse.Namespace: Parsed arguments
+        bool: True if a .env file was found and loaded, False otherwise
     """
-    desc = "Create and update LaunchDarkly feature flags with JSON variations"
-    parser = argparse.ArgumentParser(description=desc)
-
-    # Common arguments
-    api_key_help = "LaunchDarkly API key (can also be set via LD_API_KEY env var)"
-    parser.add_argument("--api-key", help=api_key_help)
+    from dotenv import find_dotenv, load_dotenv
 
-    proj_key_help = (
-        "LaunchDarkly project key (can also be set via LD_PROJECT_KEY env var)"
-    )
-    parser.add_argument("--project-key", help=proj_key_help)
+    return load_dotenv(find_dotenv(usecwd=True))
 
-    # Create subparsers for different commands
-    subparsers = parser.add_subparsers(dest="command", help="Command to execute")
 
-    # Validate command
+def _add_validate_parser(subparsers):
+    """Add the ``validate`` subcommand parser."""
     validate_parser = subparsers.add_parser(
         "validate", help="Validate existing JSON feature flags"
     )
@@ -45,7 +38,9 @@ def parse_arguments():
         "--fix", action="store_true", help="Prompt to fix invalid flags"
     )
 
-    # Create command
+
+def _add_create_parser(subparsers):
+    """Add the ``create`` subcommand parser."""
     create_parser = subparsers.add_parser("create", help="Create a new feature flag")
     create_parser.add_argument("--flag-key", required=True, help="Feature flag key")
     create_parser.add_argument("--flag-name", required=True, help="Feature flag name")
@@ -53,10 +48,108 @@ def parse_arguments():
         "--variations", required=True, help="JSON file path containing variations"
     )
 
-    # Update command
-    # We don't use the variable but need to create the subparser
+
+def _add_update_parser(subparsers):
+    """Add the ``update`` subcommand parser."""
     subparsers.add_parser("update", help="Update an existing feature flag")
 
+
+# Subparser builders keyed by command name. Only the builder for the command
+# being run is called, so unused subcommands never pay argparse setup costs.
+_SUBPARSER_BUILDERS = {
+    "validate": _add_validate_parser,
+    "create": _add_create_parser,
+    "update": _add_update_parser,
+}
+
+# Top-level options that consume the following argument(s) as their value
+_VALUE_OPTIONS = (
+    "--api-key",
+    "--project-key",
+    "--flag-key",
+    "--flag-name",
+    "--variations",
+    "--env-rules",
+)
+
+
+def _scan_command(argv):
+    """
+    Find the subcommand in the argument list without building a parser.
+
+    Args:
+        argv (list): Command line arguments (without the program name)
+
+    Returns:
+        tuple: (command or None, True if help was requested before the command)
+    """
+    tokens = iter(argv)
+    for token in tokens:
+        if token in ("-h", "--help"):
+            return None, True
+        if token == "--":
+            return next(tokens, None), False
+        if not token.startswith("-"):
+            return token, False
+        if "=" in token:
+            continue
+
+        matches = [opt for opt in _VALUE_OPTIONS if opt.startswith(token)]
+        if matches == ["--env-rules"]:
+            # nargs="+" swallows every following positional argument
+            return None, False
+        if matches:
+            next(tokens, None)
+
+    return None, False
+
+
+def parse_arguments():
+    """
+    Parse command line arguments.
+
+    Subparsers are only built for the command being run; the full set is
+    built for top-level help or when the command is not recognised.
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    argv = sys.argv[1:]
+    command, help_requested = _scan_command(argv)
+
+    if command in _SUBPARSER_BUILDERS:
+        builders = [_SUBPARSER_BUILDERS[command]]
+    elif help_requested or command is not None:
+        builders = list(_SUBPARSER_BUILDERS.values())
+    else:
+        builders = []
+
+    desc = "Create and update LaunchDarkly feature flags with JSON variations"
+    parser = argparse.ArgumentParser(description=desc)
+
+    # Common arguments
+    api_key_help = "LaunchDarkly API key (can also be set via LD_API_KEY env var)"
+    parser.add_argument("--api-key", help=api_key_help)
+
+    proj_key_help = (
+        "LaunchDarkly project key (can also be set via LD_PROJECT_KEY env var)"
+    )
+    parser.add_argument("--project-key", help=proj_key_help)
+
+    verbose_help = "Print full request payloads sent to LaunchDarkly"
+    parser.add_argument("--verbose", action="store_true", help=verbose_help)
+
+    # Create subparsers for different commands. When only some subparsers are
+    # built, the metavar is fixed so usage messages still list every command.
+    # It is left unset otherwise, since argparse also uses it to name the
+    # argument in errors such as "argument command: invalid choice".
+    subparser_options = {"dest": "command", "help": "Command to execute"}
+    if len(builders) < len(_SUBPARSER_BUILDERS):
+        subparser_options["metavar"] = "{" + ",".join(_SUBPARSER_BUILDERS) + "}"
+    subparsers = parser.add_subparsers(**subparser_options)
+    for build in builders:
+        build(subparsers)
+
     # For backward compatibility, allow running without a command
     flag_key_help = "Feature flag key (for create mode)"
     parser.add_argument("--flag-key", dest="create_flag_key", help=flag_key_help)
@@ -74,7 +167,7 @@ def parse_arguments():
         "--env-rules", dest="create_env_rules", nargs="+", help=env_rules_help
     )
 
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 def main():
@@ -84,8 +177,10 @@ def main():
     Returns:
         int: Exit code (0 for success, non-zero for failure)
     """
-    # Load environment variables from .env file if it exists
-    load_dotenv()
+    # Load environment variables from .env file if it exists. It is read even
+    # when the keys are already set, since it may also provide EDITOR and the
+    # proxy and CA bundle settings; variables already set still take precedence.
+    load_dotenv_file()
 
     args = parse_arguments()
 
@@ -102,8 +197,11 @@ def main():
     # Get project key from args or environment
     project_key = args.project_key or os.environ.get("LD_PROJECT_KEY")
 
-    # Initialize the LaunchDarkly client
-    client = LaunchDarklyClient(api_key, project_key)
+    # Initialize the LaunchDarkly client. Reads are cached so listings are
+    # reused between workflow steps; the long-lived web client leaves this off.
+    client = LaunchDarklyClient(
+        api_key, project_key, verbose=args.verbose, cache_reads=True
+    )
 
     # Determine the command to execute
     if args.command == "validate":
@@ -1,26 +1,170 @@
 """Client for interacting with LaunchDarkly API."""
 
-import json
-import requests
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+from urllib.parse import parse_qs, urlencode, urljoin, urlsplit, urlunsplit
+
+from ld_json_flag import jsonutil
+
+# Maximum number of pages fetched concurrently when paginating
+PAGE_FETCH_WORKERS = 8
+
+# Keep-alive connections kept per host; callers that run requests from
+# several threads should use at most this many so none are discarded
+CONNECTION_POOL_SIZE = 20
+
+# Seconds a cached read stays fresh before it is fetched again
+CACHE_TTL = 30
+
+# Most GET responses kept for ETag revalidation; the least recently used
+# are dropped first so a long-lived client doesn't grow without bound
+MAX_ETAG_ENTRIES = 256
+
+# Sentinel for missing dictionary keys
+_MISSING = object()
+
+
+def _cached(method):
+    """
+    Cache a read method's results on the client for CACHE_TTL seconds.
+
+    Only clients created with cache_reads=True cache results; others still
+    pick up the result of a prefetch that is in flight. Results are keyed on
+    the method, its arguments and the client's default project_key. They are
+    stored serialized and every caller gets its own parsed copy, so editing a
+    returned object never changes later reads.
+
+    Args:
+        method (callable): Client method to wrap
+
+    Returns:
+        callable: Wrapped method
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = self._cache_key(method.__name__, args, kwargs)
+        now = time.monotonic()
+        entry = self._cache.get(key) if self.cache_reads else None
+        if entry is not None and now - entry[0] < CACHE_TTL:
+            return jsonutil.loads(entry[1])
+
+        # Wait for a prefetch of the same read if one is in flight; if it
+        # failed, fall through and make the request here
+        pending = self._pending.get(key)
+        if pending is not None:
+            try:
+                return jsonutil.loads(jsonutil.dumps(pending.result()))
+            except Exception:
+                pass
+
+        result = method(self, *args, **kwargs)
+        if self.cache_reads:
+            self._cache[key] = (now, jsonutil.dumps(result))
+        return result
+
+    return wrapper
+
+
+def _link_href(data, rel):
+    """
+    Get the href of a link from a page's '_links' block.
+
+    Args:
+        data (dict): Parsed page data
+        rel (str): Link relation, e.g. 'next' or 'last'
+
+    Returns:
+        str: Link href, or None if the link is missing or empty
+    """
+    # Direct indexing skips the default-argument .get() calls on the common
+    # path where the link is present; a missing or null level ends up here.
+    try:
+        return data["_links"][rel]["href"] or None
+    except (KeyError, TypeError):
+        return None
 
 
 class LaunchDarklyClient:
     """Client for interacting with LaunchDarkly API to create and configure feature flags."""
 
-    def __init__(self, api_key, project_key=None):
+    def __init__(self, api_key, project_key=None, verbose=False, cache_reads=False):
         """
         Initialize LaunchDarkly client.
 
         Args:
             api_key (str): LaunchDarkly API key
             project_key (str, optional): LaunchDarkly project key
+            verbose (bool, optional): Print full request payloads before sending
+            cache_reads (bool, optional): Reuse read results for CACHE_TTL
+                seconds. Changes made outside this client (e.g. in the
+                LaunchDarkly UI) may not be seen until they expire, so this
+                suits short-lived runs rather than long-lived clients.
         """
         self.api_key = api_key
-        self.project_key = project_key
+        self.verbose = verbose
+        self.cache_reads = cache_reads
         self.base_url = "https://app.launchdarkly.com/api/v2"
+        self._projects_url = f"{self.base_url}/projects"
+        self.project_key = project_key
         self.headers = {"Authorization": api_key, "Content-Type": "application/json"}
 
-    def validate_tcp_port_json(self, json_obj):
+        # Recent read results and in-flight prefetches, see _cached
+        self._cache = {}
+        self._pending = {}
+        self._cache_generation = 0
+
+        # ETag and raw body of recent GET responses by URL, in least recently
+        # used order; pages are fetched from several threads, see _get_json
+        self._etags = OrderedDict()
+        self._etags_lock = threading.Lock()
+
+        # Per-thread message buffers, see captured_output
+        self._output = threading.local()
+
+        # requests is imported here rather than at module level so that CLI
+        # paths which never build a client (help, argument errors) skip it
+        import requests
+        from requests.adapters import HTTPAdapter
+        from requests.utils import get_environ_proxies
+        from urllib3.util.retry import Retry
+
+        # Reuse pooled keep-alive connections across calls instead of paying
+        # a TCP + TLS handshake per request. raise_on_status=False hands the
+        # final response back after retries so errors are reported as usual.
+        retries = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=CONNECTION_POOL_SIZE,
+            max_retries=retries,
+        )
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # With trust_env on, requests re-reads proxy variables, CA bundle
+        # variables and ~/.netrc on every call. Every call goes to base_url,
+        # so resolve the environment once here and skip the per-call lookup.
+        self.session.proxies.update(get_environ_proxies(self.base_url))
+        ca_bundle = os.environ.get("REQUESTS_CA_BUNDLE") or os.environ.get(
+            "CURL_CA_BUNDLE"
+        )
+        if ca_bundle:
+            self.session.verify = ca_bundle
+        self.session.trust_env = False
+
+    @staticmethod
+    def validate_tcp_port_json(json_obj):
         """
         Validate that a JSON object conforms to the TCP port schema.
 
@@ -35,18 +179,18 @@ class LaunchDarklyClient:
         Raises:
             ValueError: If validation fails
         """
-        # Check if it's an object
-        if not isinstance(json_obj, dict):
+        # Check if it's an object. Exact type checks are a single pointer
+        # compare, and also stop bools from passing as integer ports.
+        if type(json_obj) is not dict:
             raise ValueError("JSON must be an object")
 
         # Check if it has tcp_port property
-        if "tcp_port" not in json_obj:
+        port_value = json_obj.get("tcp_port", _MISSING)
+        if port_value is _MISSING:
             raise ValueError("JSON must contain a tcp_port property")
 
         # Validate tcp_port value
-        port_value = json_obj["tcp_port"]
-
-        if not isinstance(port_value, int):
+        if type(port_value) is not int:
             raise ValueError("tcp_port must be an integer")
 
         if port_value < 0 or port_value > 65535:
@@ -54,43 +198,385 @@ class LaunchDarklyClient:
 
         return True
 
-    def get_projects(self):
+    @property
+    def project_key(self):
+        """str: Default LaunchDarkly project key for API calls."""
+        return self._project_key
+
+    @project_key.setter
+    def project_key(self, project_key):
+        # Precompute the per-project URL prefixes once rather than on every call
+        self._project_key = project_key
+        self._flags_base = f"{self.base_url}/flags/{project_key}"
+        self._project_base = f"{self._projects_url}/{project_key}"
+
+    def _flags_url(self, project_key):
+        """Get the flags collection URL for a project."""
+        if project_key == self._project_key:
+            return self._flags_base
+        return f"{self.base_url}/flags/{project_key}"
+
+    def _project_url(self, project_key):
+        """Get the project details URL for a project."""
+        if project_key == self._project_key:
+            return self._project_base
+        return f"{self._projects_url}/{project_key}"
+
+    @staticmethod
+    def load_variations(file_path):
         """
-        Get list of all projects.
+        Load variation objects from a JSON file containing an array.
+
+        Args:
+            file_path (str): Path to JSON file with variations
 
         Returns:
-            list: List of project objects
+            list: Variation objects in file order
+
+        Raises:
+            OSError: If the file can't be opened
+            ValueError: If the file is larger than jsonutil.MAX_FILE_SIZE, is
+                not valid JSON or does not contain an array
+        """
+        with open(file_path, "rb") as f:
+            jsonutil.check_file_size(f)
+            try:
+                variations = jsonutil.loads(f.read())
+            except ValueError as e:
+                raise ValueError(f"Invalid JSON in {file_path}: {str(e)}")
+        if not isinstance(variations, list):
+            raise ValueError(f"{file_path} must contain a JSON array")
+        return variations
+
+    def validate_many(self, variations):
+        """
+        Validate the values of many variations in a single pass.
+
+        Args:
+            variations (iterable): Variation objects (a list or a stream)
+
+        Returns:
+            list: The validated variations
+
+        Raises:
+            ValueError: If there are no variations or any fails validation
+        """
+        validate = self.validate_tcp_port_json
+        validated = []
+        try:
+            # Only validation errors are wrapped; errors reading a stream of
+            # variations (e.g. invalid JSON) pass through as they are
+            for variation in variations:
+                try:
+                    validate(variation["value"])
+                except ValueError as e:
+                    raise ValueError(
+                        f"Validation failed for variation {len(validated) + 1}: {str(e)}"
+                    )
+                validated.append(variation)
+        finally:
+            # Report progress with one write rather than a print per variation
+            if validated:
+                self._print(
+                    "\n".join(
+                        f"✅ Variation {i} is valid"
+                        for i in range(1, len(validated) + 1)
+                    )
+                )
+        if not validated:
+            raise ValueError("At least one variation is required")
+        return validated
+
+    def _print(self, message):
+        """Print a message, or collect it if this thread is capturing output."""
+        lines = getattr(self._output, "lines", None)
+        if lines is None:
+            print(message)
+        else:
+            lines.append(message)
+
+    @contextmanager
+    def captured_output(self):
+        """
+        Collect the messages this client prints on the current thread.
+
+        Lets code that calls the client from worker threads print each call's
+        messages together, instead of interleaved with other threads.
+
+        Yields:
+            list: Messages printed inside the block, in order
+        """
+        previous = getattr(self._output, "lines", None)
+        self._output.lines = lines = []
+        try:
+            yield lines
+        finally:
+            self._output.lines = previous
+
+    @staticmethod
+    def _parse(response):
+        """
+        Parse a JSON response body.
+
+        Decodes the raw bytes directly, skipping the charset detection that
+        response.json() runs; LaunchDarkly always responds with UTF-8 JSON.
+
+        Args:
+            response (requests.Response): API response
+
+        Returns:
+            Any: Parsed response data
+        """
+        return jsonutil.loads(response.content)
+
+    def _check_response(self, response, action):
+        """
+        Report and raise an error for a failed API response.
+
+        Args:
+            response (requests.Response): API response
+            action (str): What was being done, for the error message
+
+        Raises:
+            requests.exceptions.HTTPError: If the response has an error status
+        """
+        if response.status_code < 400:
+            return
+
+        self._print(f"❌ Error {action}: {response.status_code}")
+        self._print(f"Response: {response.text}")
+        response.raise_for_status()
+
+    def _get_page(self, url, description):
+        """
+        Fetch a single page of a paginated collection.
+
+        Args:
+            url (str): Page URL
+            description (str): What is being fetched, for error messages
+
+        Returns:
+            dict: Parsed page data
+
+        Raises:
+            requests.exceptions.RequestException: If API request fails
+        """
+        return self._get_json(url, f"getting {description}")
+
+    def _get_json(self, url, action):
+        """
+        GET a JSON resource, revalidating a previously fetched copy by ETag.
+
+        When an earlier response for the URL carried an ETag, it is sent as
+        If-None-Match; a 304 reply is answered from the stored body without
+        downloading it again. The stored body is parsed afresh each time, so
+        callers can't alter what a later 304 returns.
+
+        Args:
+            url (str): Resource URL
+            action (str): What is being done, for error messages
+
+        Returns:
+            Any: Parsed response data
 
         Raises:
             requests.exceptions.RequestException: If API request fails
         """
-        all_items = []
-        url = f"{self.base_url}/projects"
+        with self._etags_lock:
+            stored = self._etags.get(url)
+            if stored is not None:
+                self._etags.move_to_end(url)
+
+        if stored is None:
+            response = self.session.get(url)
+        else:
+            response = self.session.get(url, headers={"If-None-Match": stored[0]})
+            if response.status_code == 304:
+                return jsonutil.loads(stored[1])
+
+        self._check_response(response, action)
+
+        etag = response.headers.get("ETag")
+        if etag:
+            with self._etags_lock:
+                self._etags[url] = (etag, response.content)
+                self._etags.move_to_end(url)
+                if len(self._etags) > MAX_ETAG_ENTRIES:
+                    self._etags.popitem(last=False)
+        return self._parse(response)
+
+    def _next_page_url(self, data):
+        """
+        Get the absolute URL of the next page from a page's links.
+
+        Args:
+            data (dict): Parsed page data
+
+        Returns:
+            str: Next page URL, or None on the last page
+        """
+        next_href = _link_href(data, "next")
+        if next_href:
+            return urljoin(self.base_url, next_href)
+        return None
+
+    def _remaining_page_urls(self, data):
+        """
+        Compute the URLs of every page after the first one.
+
+        LaunchDarkly paginates with offset/limit query parameters and links
+        to the last page, so the remaining URLs are known from page one.
+
+        Args:
+            data (dict): Parsed data of the first page
+
+        Returns:
+            list: Page URLs in order, or None if they can't be computed
+        """
+        next_href = _link_href(data, "next")
+        last_href = _link_href(data, "last")
+        if not next_href or not last_href:
+            return None
+
+        next_url = urlsplit(urljoin(self.base_url, next_href))
+        query = parse_qs(next_url.query)
+        last_query = parse_qs(urlsplit(last_href).query)
+        try:
+            next_offset = int(query["offset"][0])
+            limit = int(query["limit"][0])
+            last_offset = int(last_query["offset"][0])
+        except (KeyError, IndexError, ValueError):
+            return None
+        if limit <= 0 or last_offset < next_offset:
+            return None
+
+        urls = []
+        for offset in range(next_offset, last_offset + 1, limit):
+            query["offset"] = [str(offset)]
+            urls.append(urlunsplit(next_url._replace(query=urlencode(query, True))))
+        return urls
+
+    def _get_all_pages(self, url, description):
+        """
+        Fetch every item of a paginated collection.
+
+        After the first page, the remaining pages are fetched concurrently
+        when their URLs can be computed, and sequentially by following the
+        'next' links otherwise.
+
+        Args:
+            url (str): URL of the first page
+            description (str): What is being fetched, for error messages
+
+        Returns:
+            list: Items from all pages, in order
+
+        Raises:
+            requests.exceptions.RequestException: If API request fails
+        """
+        data = self._get_page(url, description)
+        all_items = list(data.get("items", []))
+
+        page_urls = self._remaining_page_urls(data)
+        if page_urls:
+            from concurrent.futures import ThreadPoolExecutor
+
+            workers = min(PAGE_FETCH_WORKERS, len(page_urls))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                pages = executor.map(
+                    lambda page_url: self._get_page(page_url, description), page_urls
+                )
+                for page in pages:
+                    all_items.extend(page.get("items", []))
+            return all_items
 
         # Handle pagination by following the 'next' link if it exists
+        url = self._next_page_url(data)
         while url:
-            response = requests.get(url, headers=self.headers)
+            data = self._get_page(url, description)
+            all_items.extend(data.get("items", []))
+            url = self._next_page_url(data)
 
-            if response.status_code >= 400:
-                print(f"❌ Error getting projects: {response.status_code}")
-                print(f"Response: {response.text}")
-                response.raise_for_status()
+        return all_items
 
-            data = response.json()
-            all_items.extend(data.get("items", []))
+    def _cache_key(self, method_name, args, kwargs):
+        """Get the cache key for a read method call."""
+        return (method_name, self.project_key, args, tuple(sorted(kwargs.items())))
+
+    def clear_cache(self):
+        """Drop cached read results and stored ETags so the next calls hit the API."""
+        # Prefetches already in flight must not store their now stale results
+        self._cache_generation += 1
+        self._pending.clear()
+        self._cache.clear()
+        # Stored bodies may predate a write, so don't revalidate against them
+        with self._etags_lock:
+            self._etags.clear()
+
+    def prefetch(self, method_name, *args, **kwargs):
+        """
+        Start a cached read in the background.
 
-            # Check if there's a next page
-            url = None
-            links = data.get("_links", {})
-            if links and "next" in links and links["next"]:
-                next_href = links["next"].get("href")
-                if next_href and not next_href.startswith("http"):
-                    url = f"https://app.launchdarkly.com{next_href}"
-                else:
-                    url = next_href
+        A later call with the same arguments is answered from the cache, or
+        waits for the prefetch if it is still running. Errors are neither
+        raised nor printed here; the later call makes the request itself and
+        reports them.
 
-        return all_items
+        Args:
+            method_name (str): Name of a cached read method, e.g. 'get_environments'
+            *args: Positional arguments for the method
+            **kwargs: Keyword arguments for the method
 
+        Returns:
+            concurrent.futures.Future: Future for the method's result
+        """
+        from concurrent.futures import Future
+
+        key = self._cache_key(method_name, args, kwargs)
+        pending = self._pending.get(key)
+        if pending is not None:
+            return pending
+
+        # Call the undecorated method so the worker doesn't wait on itself
+        fetch = getattr(type(self), method_name).__wrapped__
+        generation = self._cache_generation
+        future = Future()
+        self._pending[key] = future
+
+        def run():
+            # Errors are left for the foreground call to report, so nothing
+            # is printed from here over whatever the user is doing meanwhile
+            try:
+                with self.captured_output():
+                    result = fetch(self, *args, **kwargs)
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                if self.cache_reads and generation == self._cache_generation:
+                    self._cache[key] = (time.monotonic(), jsonutil.dumps(result))
+                future.set_result(result)
+            finally:
+                if self._pending.get(key) is future:
+                    self._pending.pop(key, None)
+
+        # A daemon thread, so a slow prefetch never holds up interpreter exit
+        threading.Thread(target=run, daemon=True).start()
+        return future
+
+    @_cached
+    def get_projects(self):
+        """
+        Get list of all projects.
+
+        Returns:
+            list: List of project objects
+
+        Raises:
+            requests.exceptions.RequestException: If API request fails
+        """
+        return self._get_all_pages(self._projects_url, "projects")
+
+    @_cached
     def get_environments(self, project_key=None):
         """
         Get list of all environments for a project.
@@ -109,19 +595,15 @@ class LaunchDarklyClient:
         if not project_key:
             raise ValueError("Project key is required to list environments")
 
-        response = requests.get(
-            f"{self.base_url}/projects/{project_key}", headers=self.headers
-        )
+        response = self.session.get(self._project_url(project_key))
 
-        if response.status_code >= 400:
-            print(f"❌ Error getting project details: {response.status_code}")
-            print(f"Response: {response.text}")
-            response.raise_for_status()
+        self._check_response(response, "getting project details")
 
         # Extract environments from project details
-        environments = response.json().get("environments", [])
+        environments = self._parse(response).get("environments", [])
         return environments
 
+    @_cached
     def get_feature_flags(self, project_key=None):
         """
         Get list of all feature flags for a project.
@@ -140,33 +622,9 @@ class LaunchDarklyClient:
         if not project_key:
             raise ValueError("Project key is required to list feature flags")
 
-        all_items = []
-        url = f"{self.base_url}/flags/{project_key}"
-
-        # Handle pagination by following the 'next' link if it exists
-        while url:
-            response = requests.get(url, headers=self.headers)
-
-            if response.status_code >= 400:
-                print(f"❌ Error getting feature flags: {response.status_code}")
-                print(f"Response: {response.text}")
-                response.raise_for_status()
-
-            data = response.json()
-            all_items.extend(data.get("items", []))
-
-            # Check if there's a next page
-            url = None
-            links = data.get("_links", {})
-            if links and "next" in links and links["next"]:
-                next_href = links["next"].get("href")
-                if next_href and not next_href.startswith("http"):
-                    url = f"https://app.launchdarkly.com{next_href}"
-                else:
-                    url = next_href
-
-        return all_items
+        return self._get_all_pages(self._flags_url(project_key), "feature flags")
 
+    @_cached
     def get_feature_flag(self, flag_key, project_key=None):
         """
         Get details of a specific feature flag.
@@ -186,17 +644,11 @@ class LaunchDarklyClient:
         if not project_key:
             raise ValueError("Project key is required to get a feature flag")
 
-        response = requests.get(
-            f"{self.base_url}/flags/{project_key}/{flag_key}", headers=self.headers
+        return self._get_json(
+            f"{self._flags_url(project_key)}/{flag_key}",
+            "getting feature flag details",
         )
 
-        if response.status_code >= 400:
-            print(f"❌ Error getting feature flag details: {response.status_code}")
-            print(f"Response: {response.text}")
-            response.raise_for_status()
-
-        return response.json()
-
     def create_feature_flag(self, flag_key, flag_name, variations, project_key=None):
         """
         Create a feature flag at the project level with JSON variations.
@@ -204,7 +656,7 @@ class LaunchDarklyClient:
         Args:
             flag_key (str): Unique key for the feature flag
             flag_name (str): Display name for the feature flag
-            variations (list): List of variation objects
+            variations (iterable): Variation objects (a list or a stream)
             project_key (str, optional): LaunchDarkly project key (defaults to client's project_key)
 
         Returns:
@@ -219,12 +671,7 @@ class LaunchDarklyClient:
             raise ValueError("Project key is required to create a feature flag")
 
         # Validate all variations first
-        for i, variation in enumerate(variations):
-            try:
-                self.validate_tcp_port_json(variation["value"])
-                print(f"✅ Variation {i + 1} is valid")
-            except ValueError as e:
-                raise ValueError(f"Validation failed for variation {i + 1}: {str(e)}")
+        variations = self.validate_many(variations)
 
         # Prepare the request payload for project-level flag creation
         payload = {
@@ -237,23 +684,30 @@ class LaunchDarklyClient:
             "defaults": {"onVariation": 0, "offVariation": 1},
         }
 
-        print("Creating feature flag with the following configuration:")
-        print(json.dumps(payload, indent=2))
+        if self.verbose:
+            self._print("Creating feature flag with the following configuration:")
+            self._print(jsonutil.dumps(payload, indent=True).decode())
 
         # Make API request to LaunchDarkly to create project-level flag
-        response = requests.post(
-            f"{self.base_url}/flags/{project_key}", headers=self.headers, json=payload
-        )
+        # The body is serialized up front (with orjson when available); the
+        # session already sends the application/json content type
+        try:
+            response = self.session.post(
+                self._flags_url(project_key), data=jsonutil.dumps(payload)
+            )
+        finally:
+            # Cached listings and flag details may now be out of date, even
+            # if the request failed before a response came back
+            self.clear_cache()
 
-        if response.status_code >= 400:
-            print(f"❌ Error creating feature flag: {response.status_code}")
-            print(f"Response: {response.text}")
-            response.raise_for_status()
+        self._check_response(response, "creating feature flag")
 
-        print(f"✅ Feature flag '{flag_name}' created successfully at project level")
-        print(f"Flag key: {flag_key}")
-        print(f"API Response Status: {response.status_code}")
-        return response.json()
+        self._print(
+            f"✅ Feature flag '{flag_name}' created successfully at project level"
+        )
+        self._print(f"Flag key: {flag_key}")
+        self._print(f"API Response Status: {response.status_code}")
+        return self._parse(response)
 
     def update_flag_variations(self, flag_key, variations, project_key=None):
         """
@@ -261,7 +715,7 @@ class LaunchDarklyClient:
 
         Args:
             flag_key (str): Feature flag key
-            variations (list): List of variation objects
+            variations (iterable): Variation objects (a list or a stream)
             project_key (str, optional): LaunchDarkly project key (defaults to client's project_key)
 
         Returns:
@@ -276,12 +730,7 @@ class LaunchDarklyClient:
             raise ValueError("Project key is required to update a feature flag")
 
         # Validate all variations first
-        for i, variation in enumerate(variations):
-            try:
-                self.validate_tcp_port_json(variation["value"])
-                print(f"✅ Variation {i + 1} is valid")
-            except ValueError as e:
-                raise ValueError(f"Validation failed for variation {i + 1}: {str(e)}")
+        variations = self.validate_many(variations)
 
         # Prepare the patch instructions
         patch_payload = {
@@ -289,24 +738,26 @@ class LaunchDarklyClient:
             "patch": [{"op": "replace", "path": "/variations", "value": variations}],
         }
 
-        print("Updating feature flag variations with:")
-        print(json.dumps(variations, indent=2))
+        if self.verbose:
+            self._print("Updating feature flag variations with:")
+            self._print(jsonutil.dumps(variations, indent=True).decode())
 
         # Make API request to LaunchDarkly to update the flag
-        response = requests.patch(
-            f"{self.base_url}/flags/{project_key}/{flag_key}",
-            headers=self.headers,
-            json=patch_payload,
-        )
+        try:
+            response = self.session.patch(
+                f"{self._flags_url(project_key)}/{flag_key}",
+                data=jsonutil.dumps(patch_payload),
+            )
+        finally:
+            # Cached listings and flag details may now be out of date, even
+            # if the request failed before a response came back
+            self.clear_cache()
 
-        if response.status_code >= 400:
-            print(f"❌ Error updating feature flag variations: {response.status_code}")
-            print(f"Response: {response.text}")
-            response.raise_for_status()
+        self._check_response(response, "updating feature flag variations")
 
-        print(f"✅ Feature flag '{flag_key}' variations updated successfully")
-        print(f"API Response Status: {response.status_code}")
-        return response.json()
+        self._print(f"✅ Feature flag '{flag_key}' variations updated successfully")
+        self._print(f"API Response Status: {response.status_code}")
+        return self._parse(response)
 
     def configure_environment_targeting(
         self, flag_key, environment_key, targeting_rules, project_key=None
@@ -331,7 +782,7 @@ class LaunchDarklyClient:
         if not project_key:
             raise ValueError("Project key is required to configure targeting rules")
 
-        print(f"Configuring targeting rules for environment: {environment_key}")
+        self._print(f"Configuring targeting rules for environment: {environment_key}")
 
         # Prepare the patch for targeting rules
         patch_payload = {
@@ -339,20 +790,21 @@ class LaunchDarklyClient:
         }
 
         # Update the environment-specific targeting rules
-        response = requests.patch(
-            f"{self.base_url}/flags/{project_key}/{flag_key}/environments/{environment_key}",
-            headers=self.headers,
-            json=patch_payload,
-        )
-
-        if response.status_code >= 400:
-            print(
-                f"❌ Error updating targeting rules for environment {environment_key}: {response.status_code}"
+        try:
+            response = self.session.patch(
+                f"{self._flags_url(project_key)}/{flag_key}/environments/{environment_key}",
+                data=jsonutil.dumps(patch_payload),
             )
-            print(f"Response: {response.text}")
-            response.raise_for_status()
+        finally:
+            # Cached listings and flag details may now be out of date, even
+            # if the request failed before a response came back
+            self.clear_cache()
+
+        self._check_response(
+            response, f"updating targeting rules for environment {environment_key}"
+        )
 
-        print(
+        self._print(
             f"✅ Targeting rules for '{flag_key}' in environment '{environment_key}' updated successfully"
         )
-        return response.json()
+        return self._parse(response)
@@ -1,10 +1,55 @@
 """Interactive mode for LaunchDarkly JSON Flag Utility."""
 
 import json
-import tempfile
-import subprocess
 import os
 
+from ld_json_flag import jsonutil
+from ld_json_flag.client import CONNECTION_POOL_SIZE
+
+# Maximum number of API requests the workflows issue concurrently; matches
+# the size of the client's connection pool
+API_WORKERS = CONNECTION_POOL_SIZE
+
+# Longest variation value, in characters, shown in previews
+PREVIEW_LIMIT = 200
+
+# Lower-cases ASCII letters and turns spaces into dashes in one pass
+_SLUG_TABLE = str.maketrans(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZ ", "abcdefghijklmnopqrstuvwxyz-"
+)
+
+# Instructions shown before the editor opens, printed in one write
+_EDITOR_INSTRUCTIONS = """
+INSTRUCTIONS:
+1. Edit the JSON data to define your feature flag variations
+2. Each variation needs a name, description, and value
+3. The value must contain a tcp_port property with a valid port number (0-65535)
+4. To add a new variation, add a new JSON object to the array
+5. To remove a variation, delete its JSON object from the array
+6. When adding a new variation, you can omit the _id field - it will be generated automatically
+7. Save the file and close the editor when you're done
+
+Example structure:
+[
+  {
+    "name": "Production",
+    "description": "Production configuration",
+    "value": {"tcp_port": 443}
+  },
+  {
+    "name": "Development",
+    "description": "Development configuration",
+    "value": {"tcp_port": 8080}
+  },
+  {
+    "name": "Staging",
+    "description": "Staging configuration",
+    "value": {"tcp_port": 8443}
+  }
+]
+
+Opening editor now..."""
+
 
 def select_from_list(items, prompt, item_formatter=str):
     """
@@ -22,9 +67,10 @@ def select_from_list(items, prompt, item_formatter=str):
         print("No items available.")
         return None
 
-    print(prompt)
-    for i, item in enumerate(items):
-        print(f"{i+1}. {item_formatter(item)}")
+    # Print the whole menu in one write rather than one per item
+    lines = [prompt]
+    lines.extend(f"{i+1}. {item_formatter(item)}" for i, item in enumerate(items))
+    print("\n".join(lines))
 
     while True:
         try:
@@ -41,6 +87,21 @@ def select_from_list(items, prompt, item_formatter=str):
             print("Please enter a valid number")
 
 
+def suggest_flag_key(flag_name):
+    """
+    Suggest a feature flag key for a flag name.
+
+    Args:
+        flag_name (str): Feature flag name
+
+    Returns:
+        str: The name lower-cased with spaces replaced by dashes
+    """
+    if flag_name.isascii():
+        return flag_name.translate(_SLUG_TABLE)
+    return flag_name.lower().replace(" ", "-")
+
+
 def select_project(client):
     """
     Let the user select a project.
@@ -61,6 +122,67 @@ def select_project(client):
     return selected["key"] if selected else None
 
 
+def has_json_variation(flag):
+    """
+    Check if any variation of a flag has a JSON value (dictionary).
+
+    Args:
+        flag (dict): Flag object with its variations
+
+    Returns:
+        bool: True if at least one variation value is a JSON object
+    """
+    return any(
+        isinstance(variation.get("value"), dict)
+        for variation in flag.get("variations", ())
+    )
+
+
+def fetch_flag_details(client, flags, project_key):
+    """
+    Fetch the details of several feature flags concurrently.
+
+    The client's messages and any errors are printed per flag, in flag order,
+    once all requests have finished. Flags that could not be fetched are left
+    out of the result.
+
+    Args:
+        client (LaunchDarklyClient): LaunchDarkly client
+        flags (list): Flag objects with a 'key'
+        project_key (str): LaunchDarkly project key
+
+    Returns:
+        list: (flag, flag_details) tuples in the same order as flags
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def fetch(flag):
+        flag_details = error = None
+        with client.captured_output() as output:
+            try:
+                flag_details = client.get_feature_flag(flag.get("key"), project_key)
+            except Exception as e:
+                error = e
+        return flag_details, error, list(output)
+
+    if not flags:
+        return []
+
+    workers = min(API_WORKERS, len(flags))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(fetch, flags))
+
+    fetched = []
+    for flag, (flag_details, error, output) in zip(flags, results):
+        for message in output:
+            print(message)
+        if error is not None:
+            print(f"Error checking flag {flag.get('key')}: {str(error)}")
+        else:
+            fetched.append((flag, flag_details))
+    return fetched
+
+
 def select_flag(client, project_key):
     """
     Let the user select a feature flag.
@@ -75,22 +197,9 @@ def select_flag(client, project_key):
     print(f"\nFetching feature flags for project '{project_key}'...")
     flags = client.get_feature_flags(project_key)
 
-    # Filter to flags that have JSON values
-    json_flags = []
-    for flag in flags:
-        # Get the flag details to check its variations
-        try:
-            flag_details = client.get_feature_flag(flag.get("key"), project_key)
-            variations = flag_details.get("variations", [])
-
-            # Check if any variation has a JSON value (dictionary)
-            for variation in variations:
-                value = variation.get("value")
-                if isinstance(value, dict):
-                    json_flags.append(flag)
-                    break
-        except Exception as e:
-            print(f"Error checking flag {flag.get('key')}: {str(e)}")
+    # Filter to flags that have JSON values; the default listing already
+    # includes each flag's variations
+    json_flags = [flag for flag in flags if has_json_variation(flag)]
 
     if not json_flags:
         print(f"No JSON feature flags found in project '{project_key}'.")
@@ -115,62 +224,39 @@ def edit_json_in_editor(json_data):
     Returns:
         dict: Edited JSON data or None if editing was cancelled
     """
+    # Imported here so that workflows which never open an editor, and CLI
+    # startup, don't pay for loading them
+    import shutil
+    import subprocess
+    import tempfile
+
     # Display instructions in the terminal
-    print("\nINSTRUCTIONS:")
-    print("1. Edit the JSON data to define your feature flag variations")
-    print("2. Each variation needs a name, description, and value")
-    print(
-        "3. The value must contain a tcp_port property with a valid port number (0-65535)"
-    )
-    print("4. To add a new variation, add a new JSON object to the array")
-    print("5. To remove a variation, delete its JSON object from the array")
-    print(
-        "6. When adding a new variation, you can omit the _id field - it will be generated automatically"
-    )
-    print("7. Save the file and close the editor when you're done")
-    print("\nExample structure:")
-    print(
-        """[
-  {
-    "name": "Production",
-    "description": "Production configuration",
-    "value": {"tcp_port": 443}
-  },
-  {
-    "name": "Development",
-    "description": "Development configuration",
-    "value": {"tcp_port": 8080}
-  },
-  {
-    "name": "Staging",
-    "description": "Staging configuration",
-    "value": {"tcp_port": 8443}
-  }
-]"""
-    )
-    print("\nOpening editor now...")
+    print(_EDITOR_INSTRUCTIONS)
 
     # Determine the editor to use
     editor = os.environ.get("EDITOR", "vim")
     if os.name == "nt":  # Windows
         editor = os.environ.get("EDITOR", "notepad")
 
-    # Create a temporary file with just the JSON data (no comments)
-    with tempfile.NamedTemporaryFile(
-        suffix=".json", mode="w+", delete=False
-    ) as temp_file:
+    # Create a temporary file with just the JSON data (no comments), writing
+    # through the descriptor mkstemp returns instead of reopening the path
+    fd, temp_file_path = tempfile.mkstemp(suffix=".json")
+    with open(fd, "wb") as temp_file:
         # Write the JSON data to the file with proper formatting
-        temp_file.write(json.dumps(json_data, indent=2))
-        temp_file_path = temp_file.name
+        temp_file.write(jsonutil.dumps(json_data, indent=True))
 
     try:
-        # Open the editor
-        subprocess.call([editor, temp_file_path])
-
-        # Read the modified content
-        with open(temp_file_path, "r") as temp_file:
+        # Open the editor. subprocess only launches via posix_spawn (no fork
+        # of the interpreter) when the executable is a full path and there is
+        # no close_fds, preexec_fn, pass_fds or cwd; our descriptors are
+        # non-inheritable already, so close_fds=False is safe.
+        editor_path = shutil.which(editor) or editor
+        subprocess.run([editor_path, temp_file_path], close_fds=False)
+
+        # Read the modified content in one go and parse the bytes directly
+        with open(temp_file_path, "rb") as temp_file:
             try:
-                return json.load(temp_file)
+                return jsonutil.loads(temp_file.read())
             except json.JSONDecodeError as e:
                 print(f"❌ Error: Invalid JSON format: {str(e)}")
                 return None
@@ -179,6 +265,66 @@ def edit_json_in_editor(json_data):
         os.unlink(temp_file_path)
 
 
+def find_invalid_variations(client, variations):
+    """
+    Check edited variations locally before they are sent to the API.
+
+    Args:
+        client (LaunchDarklyClient): LaunchDarkly client
+        variations: Edited variations, expected to be a list of objects
+
+    Returns:
+        list: (index, error) tuples for each invalid variation; index is None
+            if the variations are not a list at all
+    """
+    if not isinstance(variations, list):
+        return [(None, "Variations must be a JSON array")]
+
+    invalid = []
+    for i, variation in enumerate(variations):
+        if not isinstance(variation, dict):
+            invalid.append((i, "Variation must be an object"))
+            continue
+        try:
+            client.validate_tcp_port_json(variation.get("value", {}))
+        except ValueError as e:
+            invalid.append((i, str(e)))
+    return invalid
+
+
+def preview_value(value, limit=PREVIEW_LIMIT):
+    """
+    Render a variation value as compact JSON for a one-line preview.
+
+    Args:
+        value: JSON serializable value
+        limit (int, optional): Maximum number of characters to show
+
+    Returns:
+        str: Compact JSON, cut off with '…' if longer than limit
+    """
+    text = jsonutil.dumps(value).decode()
+    if len(text) > limit:
+        return text[:limit] + "…"
+    return text
+
+
+def format_variations(variations):
+    """
+    Format variations as a numbered preview, one line per variation.
+
+    Args:
+        variations (list): Variation objects
+
+    Returns:
+        str: Newline-joined preview lines
+    """
+    return "\n".join(
+        f"{i+1}. {var.get('name')}: {preview_value(var.get('value'))}"
+        for i, var in enumerate(variations)
+    )
+
+
 def update_flag_variations_workflow(client, project_key=None):
     """
     Interactive workflow for updating feature flag variations.
@@ -218,9 +364,7 @@ def update_flag_variations_workflow(client, project_key=None):
         print(f"❌ No variations found for flag '{flag_key}'.")
         return False
 
-    print("\nCurrent variations:")
-    for i, var in enumerate(variations):
-        print(f"{i+1}. {var.get('name')}: {json.dumps(var.get('value'))}")
+    print(f"\nCurrent variations:\n{format_variations(variations)}")
 
     # Let the user edit the variations
     print("\nOpening editor to modify flag variations...")
@@ -233,10 +377,19 @@ def update_flag_variations_workflow(client, project_key=None):
         print("❌ Editing cancelled or invalid JSON.")
         return False
 
+    # Catch schema errors before the confirmation prompt and the API call
+    invalid_variations = find_invalid_variations(client, edited_variations)
+    if invalid_variations:
+        for i, error in invalid_variations:
+            if i is None:
+                print(f"❌ {error}")
+            else:
+                print(f"❌ Variation {i+1} is invalid: {error}")
+        print("❌ Some variations are invalid. Update cancelled.")
+        return False
+
     # Confirm the update
-    print("\nUpdated variations:")
-    for i, var in enumerate(edited_variations):
-        print(f"{i+1}. {var.get('name')}: {json.dumps(var.get('value'))}")
+    print(f"\nUpdated variations:\n{format_variations(edited_variations)}")
 
     confirm = input("\nUpdate the flag with these variations? (y/n): ")
     if confirm.lower() != "y":
@@ -254,7 +407,7 @@ def update_flag_variations_workflow(client, project_key=None):
 
 
 def create_flag_workflow(
-    client, flag_key, flag_name, variations_file, env_rules=None, project_key=None
+    client, flag_key, flag_name, variations_source, env_rules=None, project_key=None
 ):
     """
     Create a new feature flag with JSON variations.
@@ -263,7 +416,8 @@ def create_flag_workflow(
         client (LaunchDarklyClient): LaunchDarkly client
         flag_key (str): Feature flag key
         flag_name (str): Feature flag name
-        variations_file (str): Path to JSON file with variations
+        variations_source: Path to JSON file with variations, or the already
+            parsed variations (e.g. from the editor)
         env_rules (list, optional): List of environment:rules_file pairs
         project_key (str, optional): Project key (if not already set in client)
 
@@ -277,13 +431,26 @@ def create_flag_workflow(
             return False
         client.project_key = project_key
 
-    # Load variations from JSON file
-    try:
-        with open(variations_file, "r") as f:
-            variations = json.load(f)
-    except Exception as e:
-        print(f"❌ Error loading variations from file: {str(e)}")
-        return False
+    if not isinstance(variations_source, str):
+        # Variations are already in memory (e.g. from the editor), so check
+        # them locally before the API call, as the update workflow does
+        variations = variations_source
+        invalid_variations = find_invalid_variations(client, variations)
+        if invalid_variations:
+            for i, error in invalid_variations:
+                if i is None:
+                    print(f"❌ {error}")
+                else:
+                    print(f"❌ Variation {i+1} is invalid: {error}")
+            print("❌ Some variations are invalid. Flag not created.")
+            return False
+    else:
+        # Load variations from the JSON file
+        try:
+            variations = client.load_variations(variations_source)
+        except Exception as e:
+            print(f"❌ Error loading variations from file: {str(e)}")
+            return False
 
     # Create the feature flag
     try:
@@ -294,24 +461,145 @@ def create_flag_workflow(
 
     # Process environment targeting rules if provided
     if env_rules:
-        for env_rule in env_rules:
-            try:
-                env, rule_path = env_rule.split(":", 1)
+        apply_env_rules(client, flag_key, env_rules, project_key)
 
-                with open(rule_path, "r") as f:
-                    targeting_rules = json.load(f)
+    print("✅ Feature flag setup complete")
+    return True
+
+
+def apply_env_rules(client, flag_key, env_rules, project_key=None):
+    """
+    Configure environment targeting rules for a flag, one environment per thread.
+
+    The client's messages and any errors are printed per environment, in the
+    order the rules were given, once all environments have been processed.
+
+    Args:
+        client (LaunchDarklyClient): LaunchDarkly client
+        flag_key (str): Feature flag key
+        env_rules (list): List of environment:rules_file pairs
+        project_key (str, optional): LaunchDarkly project key
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def apply(env_rule):
+        try:
+            env, rule_path = env_rule.split(":", 1)
+        except ValueError:
+            return [
+                f"❌ Invalid format for environment rules: {env_rule}",
+                "Format should be 'environment:path.json'",
+            ]
+
+        with client.captured_output() as output:
+            try:
+                with open(rule_path, "rb") as f:
+                    jsonutil.check_file_size(f)
+                    targeting_rules = jsonutil.loads(f.read())
 
                 client.configure_environment_targeting(
                     flag_key, env, targeting_rules, project_key
                 )
-            except ValueError:
-                print(f"❌ Invalid format for environment rules: {env_rule}")
-                print("Format should be 'environment:path.json'")
+                error = None
             except Exception as e:
-                print(f"❌ Error configuring environment '{env}': {str(e)}")
+                error = f"❌ Error configuring environment '{env}': {str(e)}"
+        messages = list(output)
+        if error:
+            messages.append(error)
+        return messages
 
-    print("✅ Feature flag setup complete")
-    return True
+    if not env_rules:
+        return
+
+    workers = min(API_WORKERS, len(env_rules))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(apply, env_rules))
+
+    for messages in results:
+        for message in messages:
+            print(message)
+
+
+def apply_flag_updates(client, updates, project_key=None):
+    """
+    Update the variations of several flags, one flag per thread.
+
+    The client's messages and each flag's result are printed per flag, in the
+    order the updates were given, once all flags have been processed.
+
+    Args:
+        client (LaunchDarklyClient): LaunchDarkly client
+        updates (list): List of (flag_key, variations) pairs
+        project_key (str, optional): LaunchDarkly project key
+    """
+
+    def update(pending):
+        flag_key, variations = pending
+        with client.captured_output() as output:
+            try:
+                client.update_flag_variations(flag_key, variations, project_key)
+                result = f"✅ Successfully updated variations for flag '{flag_key}'"
+            except Exception as e:
+                result = f"❌ Error updating flag variations: {str(e)}"
+        return list(output) + [result]
+
+    if len(updates) == 1:
+        results = [update(updates[0])]
+    elif updates:
+        from concurrent.futures import ThreadPoolExecutor
+
+        workers = min(API_WORKERS, len(updates))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(update, updates))
+    else:
+        results = []
+
+    for messages in results:
+        for message in messages:
+            print(message)
+
+
+def build_template_variations(environments):
+    """
+    Build the starting variations shown in the editor for a new flag.
+
+    Args:
+        environments (list): Environment objects of the project
+
+    Returns:
+        list: One variation per environment, or a default Production and
+            Development pair if there are no environments
+    """
+    if not environments:
+        return [
+            {
+                "name": "Production",
+                "description": "Production configuration",
+                "value": {"tcp_port": 443},
+            },
+            {
+                "name": "Development",
+                "description": "Development configuration",
+                "value": {"tcp_port": 8080},
+            },
+        ]
+
+    template_variations = []
+    for i, env in enumerate(environments):
+        env_name = env.get("name", f"Environment {i+1}")
+        env_key = env.get("key", f"env-{i+1}")
+
+        # Use different port numbers for different environments
+        port = 443 if "prod" in env_key.lower() else 8080
+
+        template_variations.append(
+            {
+                "name": env_name,
+                "description": f"{env_name} configuration",
+                "value": {"tcp_port": port},
+            }
+        )
+    return template_variations
 
 
 def interactive_workflow(client):
@@ -346,6 +634,10 @@ def interactive_workflow(client):
             return False
 
         if choice == "1":
+            # Fetch environments (needed for the template) while the user
+            # types the flag name and key
+            client.prefetch("get_environments", project_key)
+
             # Create a new flag - ask for name first
             flag_name = input("\nEnter feature flag name: ")
             if not flag_name:
@@ -353,7 +645,7 @@ def interactive_workflow(client):
                 continue
 
             # Auto-generate a key from the name and allow user to change it
-            suggested_key = flag_name.lower().replace(" ", "-")
+            suggested_key = suggest_flag_key(flag_name)
             flag_key = (
                 input(f"Enter feature flag key (suggested: {suggested_key}): ")
                 or suggested_key
@@ -367,58 +659,18 @@ def interactive_workflow(client):
                 print("\nFetching environments for the selected project...")
                 environments = client.get_environments(project_key)
 
-                # Create template variations based on project environments
-                template_variations = []
-
-                # If no environments found, use default template
+                # Create template variations based on project environments,
+                # falling back to the default template if there are none
                 if not environments:
                     print("No environments found. Using default template.")
-                    template_variations = [
-                        {
-                            "name": "Production",
-                            "description": "Production configuration",
-                            "value": {"tcp_port": 443},
-                        },
-                        {
-                            "name": "Development",
-                            "description": "Development configuration",
-                            "value": {"tcp_port": 8080},
-                        },
-                    ]
-                else:
-                    # Create a variation for each environment
-                    for i, env in enumerate(environments):
-                        env_name = env.get("name", f"Environment {i+1}")
-                        env_key = env.get("key", f"env-{i+1}")
-
-                        # Use different port numbers for different environments
-                        port = 443 if "prod" in env_key.lower() else 8080
-
-                        template_variations.append(
-                            {
-                                "name": env_name,
-                                "description": f"{env_name} configuration",
-                                "value": {"tcp_port": port},
-                            }
-                        )
-
+                template_variations = build_template_variations(environments)
+                if environments:
                     print(
                         f"Created template with {len(template_variations)} variations based on project environments."
                     )
             except Exception as e:
                 print(f"Error fetching environments: {str(e)}. Using default template.")
-                template_variations = [
-                    {
-                        "name": "Production",
-                        "description": "Production configuration",
-                        "value": {"tcp_port": 443},
-                    },
-                    {
-                        "name": "Development",
-                        "description": "Development configuration",
-                        "value": {"tcp_port": 8080},
-                    },
-                ]
+                template_variations = build_template_variations([])
 
             print("\nOpening editor to define your flag variations...")
             print(
@@ -430,21 +682,11 @@ def interactive_workflow(client):
                 print("❌ Editing cancelled or invalid JSON.")
                 return False
 
-            # Save variations to a temporary file
-            with tempfile.NamedTemporaryFile(
-                suffix=".json", mode="w+", delete=False
-            ) as temp_file:
-                json.dump(variations, temp_file, indent=2)
-                variations_file = temp_file.name
-
-            try:
-                # Create the flag without targeting rules
-                return create_flag_workflow(
-                    client, flag_key, flag_name, variations_file, None, project_key
-                )
-            finally:
-                # Clean up temporary files
-                os.unlink(variations_file)
+            # Create the flag without targeting rules, passing the edited
+            # variations straight through
+            return create_flag_workflow(
+                client, flag_key, flag_name, variations, None, project_key
+            )
 
         elif choice == "2":
             # Update an existing flag, passing the already selected project_key
@@ -485,22 +727,12 @@ def validate_flags_workflow(client, fix_invalid=False, project_key=None):
     print(f"\nValidating JSON feature flags in project '{project_key}'...")
     flags = client.get_feature_flags(project_key)
 
-    # Filter to flags that have JSON values
-    json_flags = []
-    for flag in flags:
-        # Get the flag details to check its variations
-        try:
-            flag_details = client.get_feature_flag(flag.get("key"), project_key)
-            variations = flag_details.get("variations", [])
-
-            # Check if any variation has a JSON value (dictionary)
-            for variation in variations:
-                value = variation.get("value")
-                if isinstance(value, dict):
-                    json_flags.append((flag, flag_details))
-                    break
-        except Exception as e:
-            print(f"Error checking flag {flag.get('key')}: {str(e)}")
+    # Filter to flags that have JSON values, fetching their details in parallel
+    json_flags = [
+        (flag, flag_details)
+        for flag, flag_details in fetch_flag_details(client, flags, project_key)
+        if has_json_variation(flag_details)
+    ]
 
     if not json_flags:
         print(f"No JSON feature flags found in project '{project_key}'.")
@@ -547,44 +779,46 @@ def validate_flags_workflow(client, fix_invalid=False, project_key=None):
     # Fix invalid flags
     print("\nFixing invalid flags...")
 
-    for flag_key, flag_name, variations, invalid_variations in invalid_flags:
-        print(f"\nFixing flag: {flag_name} (key: {flag_key})")
-        print("Invalid variations:")
-        for i, variation, error in invalid_variations:
-            print(f"  {i+1}. {variation.get('name')}: {error}")
+    # Confirmed updates are sent together once every flag has been reviewed,
+    # or as soon as the review is interrupted so confirmed fixes aren't lost
+    pending_updates = []
 
-        # Let the user edit the variations
-        print("\nOpening editor to fix flag variations...")
-        edited_variations = edit_json_in_editor(variations)
+    try:
+        for flag_key, flag_name, variations, invalid_variations in invalid_flags:
+            print(f"\nFixing flag: {flag_name} (key: {flag_key})")
+            print("Invalid variations:")
+            for i, variation, error in invalid_variations:
+                print(f"  {i+1}. {variation.get('name')}: {error}")
 
-        if not edited_variations:
-            print("❌ Editing cancelled or invalid JSON.")
-            continue
+            # Let the user edit the variations
+            print("\nOpening editor to fix flag variations...")
+            edited_variations = edit_json_in_editor(variations)
 
-        # Validate the edited variations
-        all_valid = True
-        for i, variation in enumerate(edited_variations):
-            try:
-                client.validate_tcp_port_json(variation.get("value", {}))
-            except ValueError as e:
-                print(f"❌ Variation {i+1} is still invalid: {str(e)}")
-                all_valid = False
+            if not edited_variations:
+                print("❌ Editing cancelled or invalid JSON.")
+                continue
 
-        if not all_valid:
-            print("❌ Some variations are still invalid. Skipping update.")
-            continue
+            # Validate the edited variations
+            still_invalid = find_invalid_variations(client, edited_variations)
+            for i, error in still_invalid:
+                if i is None:
+                    print(f"❌ {error}")
+                else:
+                    print(f"❌ Variation {i+1} is still invalid: {error}")
 
-        # Confirm the update
-        confirm = input(f"\nUpdate flag '{flag_name}' with fixed variations? (y/n): ")
-        if confirm.lower() != "y":
-            print("Update cancelled.")
-            continue
+            if still_invalid:
+                print("❌ Some variations are still invalid. Skipping update.")
+                continue
 
-        # Update the flag
-        try:
-            client.update_flag_variations(flag_key, edited_variations, project_key)
-            print(f"✅ Successfully updated variations for flag '{flag_key}'")
-        except Exception as e:
-            print(f"❌ Error updating flag variations: {str(e)}")
+            # Confirm the update
+            confirm = input(
+                f"\nUpdate flag '{flag_name}' with fixed variations? (y/n): "
+            )
+            if confirm.lower() != "y":
+                print("Update cancelled.")
+                continue
 
+            pending_updates.append((flag_key, edited_variations))
+    finally:
+        apply_flag_updates(client, pending_updates, project_key)
     return True
@@ -0,0 +1,68 @@
+"""JSON helpers that use orjson when it is installed."""
+
+import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Largest JSON input file accepted, in bytes
+MAX_FILE_SIZE = 10 * 1024 * 1024
+
+
+def dumps(obj, indent=False):
+    """
+    Serialize an object to JSON.
+
+    Args:
+        obj: JSON serializable data
+        indent (bool, optional): Pretty-print with two-space indentation
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+    if indent:
+        return json.dumps(obj, indent=2).encode()
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def loads(data):
+    """
+    Deserialize JSON.
+
+    Args:
+        data (bytes or str): JSON document
+
+    Returns:
+        Any: Deserialized data
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def check_file_size(f):
+    """
+    Reject an open JSON input file that is larger than MAX_FILE_SIZE.
+
+    Checking up front keeps an oversized file from being read into memory.
+
+    Args:
+        f (file): Open file object
+
+    Raises:
+        ValueError: If the file is too large
+    """
+    size = os.fstat(f.fileno()).st_size
+    if size > MAX_FILE_SIZE:
+        raise ValueError(
+            f"{f.name} is too large ({size} bytes, limit is {MAX_FILE_SIZE})"
+        )
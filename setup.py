@@ -15,6 +15,9 @@ setup(
         "launchdarkly-server-sdk>=9.6.0",
         "launchdarkly-server-sdk-ai>=0.20.0",
     ],
+    extras_require={
+        "fast": ["orjson>=3.9"],
+    },
     entry_points={
         "console_scripts": [
             "ld-json-flag=ld_json_flag.cli:main",
@@ -0,0 +1,44 @@
+"""Shared test fixtures."""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from ld_json_flag.client import LaunchDarklyClient
+
+
+def pytest_configure(config):
+    """Register the markers used by the test suite."""
+    config.addinivalue_line(
+        "markers", "serial: test touches shared state and must not run under xdist"
+    )
+    config.addinivalue_line(
+        "markers", "slow: test takes noticeably longer (deselect with -m 'not slow')"
+    )
+
+
+def _resp(payload, status=200, headers=None):
+    """Build a lightweight stand-in for a successful JSON API response."""
+    content = json.dumps(payload).encode()
+    return SimpleNamespace(
+        status_code=status,
+        content=content,
+        text=content.decode(),
+        headers=headers or {},
+    )
+
+
+@pytest.fixture
+def make_response():
+    """Factory for lightweight JSON API responses."""
+    return _resp
+
+
+@pytest.fixture
+def client():
+    """Mock LaunchDarkly client limited to the real client's interface."""
+    mock_client = MagicMock(spec_set=LaunchDarklyClient)
+    mock_client.project_key = None
+    return mock_client
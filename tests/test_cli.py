@@ -3,6 +3,8 @@
 from unittest.mock import patch, MagicMock, ANY
 import sys
 from io import StringIO
+import pytest
+from ld_json_flag import cli
 from ld_json_flag.cli import main, parse_arguments
 
 
@@ -20,7 +22,9 @@ def test_validate_command(mock_client_class, mock_validate_workflow):
     result = main()
 
     # Assertions
-    mock_client_class.assert_called_once_with("fake-key", ANY)
+    mock_client_class.assert_called_once_with(
+        "fake-key", ANY, verbose=False, cache_reads=True
+    )
     mock_validate_workflow.assert_called_once_with(mock_client, False, ANY)
     assert result == 0
 
@@ -39,11 +43,34 @@ def test_validate_command_with_fix(mock_client_class, mock_validate_workflow):
     result = main()
 
     # Assertions
-    mock_client_class.assert_called_once_with("fake-key", ANY)
+    mock_client_class.assert_called_once_with(
+        "fake-key", ANY, verbose=False, cache_reads=True
+    )
     mock_validate_workflow.assert_called_once_with(mock_client, True, ANY)
     assert result == 0
 
 
+@patch("ld_json_flag.cli.validate_flags_workflow")
+@patch("ld_json_flag.cli.LaunchDarklyClient")
+@patch(
+    "sys.argv",
+    ["ld_json_flag.cli", "--api-key", "fake-key", "--verbose", "validate"],
+)
+def test_verbose_option(mock_client_class, mock_validate_workflow):
+    """Test that --verbose is passed through to the client."""
+    # Setup
+    mock_validate_workflow.return_value = True
+
+    # Call the function
+    result = main()
+
+    # Assertions
+    mock_client_class.assert_called_once_with(
+        "fake-key", ANY, verbose=True, cache_reads=True
+    )
+    assert result == 0
+
+
 @patch("ld_json_flag.cli.update_flag_variations_workflow")
 @patch("ld_json_flag.cli.LaunchDarklyClient")
 @patch("sys.argv", ["ld_json_flag.cli", "--api-key", "fake-key", "update"])
@@ -58,7 +85,9 @@ def test_update_command(mock_client_class, mock_update_workflow):
     result = main()
 
     # Assertions
-    mock_client_class.assert_called_once_with("fake-key", ANY)
+    mock_client_class.assert_called_once_with(
+        "fake-key", ANY, verbose=False, cache_reads=True
+    )
     mock_update_workflow.assert_called_once_with(mock_client)
     assert result == 0
 
@@ -91,7 +120,9 @@ def test_create_command(mock_client_class, mock_create_workflow):
     result = main()
 
     # Assertions
-    mock_client_class.assert_called_once_with("fake-key", ANY)
+    mock_client_class.assert_called_once_with(
+        "fake-key", ANY, verbose=False, cache_reads=True
+    )
     mock_create_workflow.assert_called_once_with(
         mock_client, "test-flag", "Test Flag", "variations.json", None, ANY
     )
@@ -117,7 +148,9 @@ def test_interactive_mode(mock_client_class, mock_interactive_workflow):
         result = main()
 
         # Assertions
-        mock_client_class.assert_called_once_with("fake-key", ANY)
+        mock_client_class.assert_called_once_with(
+            "fake-key", ANY, verbose=False, cache_reads=True
+        )
         mock_interactive_workflow.assert_called_once_with(mock_client)
         assert result == 0
         assert (
@@ -156,10 +189,8 @@ def test_api_key_from_env(mock_environ_get):
 def test_project_key_from_env(mock_environ_get):
     """Test getting project key from environment variable."""
     # Setup
-    mock_environ_get.side_effect = lambda key, default=None: {
-        "LD_API_KEY": "env-api-key",
-        "LD_PROJECT_KEY": "env-project-key",
-    }.get(key, default)
+    env = {"LD_API_KEY": "env-api-key", "LD_PROJECT_KEY": "env-project-key"}
+    mock_environ_get.side_effect = lambda key, default=None: env.get(key, default)
 
     # Call the function with no project key in args
     with patch("sys.argv", ["ld_json_flag.cli", "--api-key", "arg-api-key"]):
@@ -177,9 +208,29 @@ def test_project_key_from_env(mock_environ_get):
     mock_environ_get.assert_any_call("LD_PROJECT_KEY")  # But env var is checked
 
 
-@patch("ld_json_flag.cli.load_dotenv")
+@patch("ld_json_flag.cli.load_dotenv_file")
 def test_load_dotenv_called(mock_load_dotenv):
-    """Test that load_dotenv is called."""
+    """Test that the .env file is loaded."""
+    # Mock the main function to avoid actually running it
+    with patch("ld_json_flag.cli.LaunchDarklyClient"), patch(
+        "ld_json_flag.cli.interactive_workflow"
+    ), patch(
+        "ld_json_flag.cli.os.environ.get",
+        side_effect=lambda key, default=None: (
+            "fake-key" if key == "LD_API_KEY" else default
+        ),
+    ), patch(
+        "sys.argv", ["ld_json_flag.cli"]
+    ):
+        main()
+
+    # Assertions
+    mock_load_dotenv.assert_called_once()
+
+
+@patch("ld_json_flag.cli.load_dotenv_file")
+def test_load_dotenv_called_when_env_set(mock_load_dotenv):
+    """Test that .env is still read when the keys are already in the environment."""
     # Mock the main function to avoid actually running it
     with patch("ld_json_flag.cli.LaunchDarklyClient"), patch(
         "ld_json_flag.cli.interactive_workflow"
@@ -204,3 +255,132 @@ def test_missing_api_key(mock_stdout):
     # Assertions
     assert result == 1  # Should return error code
     assert "Error: API key is required" in mock_stdout.getvalue()
+
+
+def _spy_builders():
+    """Wrap each subparser builder in a mock that records calls."""
+    return {
+        name: MagicMock(wraps=build) for name, build in cli._SUBPARSER_BUILDERS.items()
+    }
+
+
+def test_parse_arguments_builds_only_requested_subparser():
+    """Test that only the subparser for the requested command is built."""
+    builders = _spy_builders()
+    with patch.dict(cli._SUBPARSER_BUILDERS, builders), patch(
+        "sys.argv", ["ld_json_flag.cli", "--api-key", "validate", "validate", "--fix"]
+    ):
+        args = parse_arguments()
+
+    # Assertions
+    assert args.api_key == "validate"
+    assert args.command == "validate"
+    assert args.fix is True
+    builders["validate"].assert_called_once()
+    builders["create"].assert_not_called()
+    builders["update"].assert_not_called()
+
+
+def test_parse_arguments_no_command_builds_no_subparsers():
+    """Test that running without a command skips every subparser."""
+    builders = _spy_builders()
+    with patch.dict(cli._SUBPARSER_BUILDERS, builders), patch(
+        "sys.argv", ["ld_json_flag.cli", "--flag-key", "create"]
+    ):
+        args = parse_arguments()
+
+    # Assertions
+    assert args.command is None
+    assert args.create_flag_key == "create"
+    for builder in builders.values():
+        builder.assert_not_called()
+
+
+@patch("sys.stdout", new_callable=StringIO)
+def test_parse_arguments_help_builds_all_subparsers(mock_stdout):
+    """Test that top-level help lists every command."""
+    builders = _spy_builders()
+    with patch.dict(cli._SUBPARSER_BUILDERS, builders), patch(
+        "sys.argv", ["ld_json_flag.cli", "--help"]
+    ):
+        with pytest.raises(SystemExit):
+            parse_arguments()
+
+    # Assertions
+    for builder in builders.values():
+        builder.assert_called_once()
+    assert "Validate existing JSON feature flags" in mock_stdout.getvalue()
+    assert "Update an existing feature flag" in mock_stdout.getvalue()
+
+
+@patch("sys.stderr", new_callable=StringIO)
+def test_parse_arguments_invalid_command(mock_stderr):
+    """Test that an unknown command is reported against the command argument."""
+    with patch("sys.argv", ["ld_json_flag.cli", "delete"]):
+        with pytest.raises(SystemExit):
+            parse_arguments()
+
+    # Assertions
+    assert "argument command: invalid choice: 'delete'" in mock_stderr.getvalue()
+    assert "{validate,create,update}" in mock_stderr.getvalue()
+
+
+@patch("sys.stderr", new_callable=StringIO)
+def test_parse_arguments_usage_lists_all_commands(mock_stderr):
+    """Test that usage errors list every command when one subparser was built."""
+    with patch("sys.argv", ["ld_json_flag.cli", "--bogus", "update"]):
+        with pytest.raises(SystemExit):
+            parse_arguments()
+
+    # Assertions
+    assert "{validate,create,update}" in mock_stderr.getvalue()
+
+
+@pytest.fixture
+def dotenv_dir(tmp_path, monkeypatch):
+    """Provide a working directory with a .env file."""
+    project_dir = tmp_path / "project"
+    project_dir.mkdir()
+    (project_dir / ".env").write_text("LD_TEST_DOTENV=from-file\n")
+    monkeypatch.chdir(project_dir)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.delenv("LD_TEST_DOTENV", raising=False)
+    return project_dir
+
+
+def test_load_dotenv_file(dotenv_dir, tmp_path):
+    """Test that .env values are loaded without being written anywhere else."""
+    # Call the function
+    result = cli.load_dotenv_file()
+
+    # Assertions
+    assert result is True
+    assert cli.os.environ["LD_TEST_DOTENV"] == "from-file"
+    assert not (tmp_path / "cache").exists()
+
+
+def test_load_dotenv_file_keeps_existing_env(dotenv_dir, monkeypatch):
+    """Test that variables already in the environment are not overridden."""
+    monkeypatch.setenv("LD_TEST_DOTENV", "from-env")
+
+    # Call the function
+    cli.load_dotenv_file()
+
+    # Assertions
+    assert cli.os.environ["LD_TEST_DOTENV"] == "from-env"
+
+
+def test_cli_import_does_not_load_requests():
+    """Test that importing the CLI defers loading heavy modules."""
+    import subprocess
+
+    code = (
+        "import sys, ld_json_flag.cli; "
+        "deferred = ('requests', 'dotenv', 'concurrent.futures', "
+        "'subprocess', 'tempfile'); "
+        "sys.exit(any(name in sys.modules for name in deferred))"
+    )
+    result = subprocess.run([sys.executable, "-c", code])
+
+    # Assertions
+    assert result.returncode == 0
@@ -1,8 +1,13 @@
 """Tests for the LaunchDarkly client."""
 
+import json
+import threading
 import pytest
-from unittest.mock import patch, MagicMock
-from ld_json_flag.client import LaunchDarklyClient
+import requests
+import responses
+from unittest.mock import patch, MagicMock, call
+from ld_json_flag import jsonutil
+from ld_json_flag.client import CACHE_TTL, CONNECTION_POOL_SIZE, LaunchDarklyClient
 
 
 def test_tcp_port_json_validation():
@@ -23,54 +28,114 @@ def test_tcp_port_json_validation():
     with pytest.raises(ValueError, match="tcp_port must be an integer"):
         client.validate_tcp_port_json({"tcp_port": "443"})
 
+    with pytest.raises(ValueError, match="tcp_port must be an integer"):
+        client.validate_tcp_port_json({"tcp_port": True})
+
+    with pytest.raises(ValueError, match="JSON must contain a tcp_port property"):
+        client.validate_tcp_port_json({"tcp_port_": 443})
+
     with pytest.raises(ValueError, match="tcp_port must be between 0 and 65535"):
         client.validate_tcp_port_json({"tcp_port": -1})
 
     with pytest.raises(ValueError, match="tcp_port must be between 0 and 65535"):
         client.validate_tcp_port_json({"tcp_port": 65536})
 
+    # The validator needs no client state, so it is usable from the class
+    assert LaunchDarklyClient.validate_tcp_port_json(valid_json) is True
 
-@patch("requests.get")
-def test_get_projects(mock_get):
-    """Test getting projects."""
-    # Mock responses for pagination
-    first_page_response = MagicMock()
-    first_page_response.status_code = 200
-    first_page_response.json.return_value = {
-        "items": [
-            {"key": "project1", "name": "Project 1"},
-            {"key": "project2", "name": "Project 2"},
-        ],
-        "_links": {
-            "next": {"href": "https://app.launchdarkly.com/api/v2/projects?page=2"}
-        },
-    }
 
-    second_page_response = MagicMock()
-    second_page_response.status_code = 200
-    second_page_response.json.return_value = {
-        "items": [{"key": "project3", "name": "Project 3"}],
-        "_links": {},  # No next page
-    }
+def test_client_session():
+    """Test that the client shares one pooled, retrying session."""
+    client = LaunchDarklyClient("fake-key", "fake-project")
 
-    # Configure mock to return different responses for different URLs
-    mock_get.side_effect = [first_page_response, second_page_response]
+    # Assertions
+    assert client.session.headers["Authorization"] == "fake-key"
+    assert client.session.headers["Content-Type"] == "application/json"
+    adapter = client.session.get_adapter("https://app.launchdarkly.com")
+    assert adapter.max_retries.total == 3
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == CONNECTION_POOL_SIZE
+    assert 503 in adapter.max_retries.status_forcelist
+
+
+def test_client_session_env_resolved_once(monkeypatch):
+    """Test that proxy and CA bundle settings are read once at construction."""
+    # Setup
+    monkeypatch.setenv("HTTPS_PROXY", "http://proxy.example:3128")
+    monkeypatch.setenv("REQUESTS_CA_BUNDLE", "/etc/ssl/corp.pem")
+    monkeypatch.delenv("NO_PROXY", raising=False)
+    monkeypatch.delenv("no_proxy", raising=False)
 
-    # Test function
-    client = LaunchDarklyClient("fake-key")
-    projects = client.get_projects()
+    # Call the function
+    client = LaunchDarklyClient("fake-key", "fake-project")
 
     # Assertions
-    assert mock_get.call_count == 2
-    mock_get.assert_any_call(
+    assert client.session.trust_env is False
+    assert client.session.proxies["https"] == "http://proxy.example:3128"
+    assert client.session.verify == "/etc/ssl/corp.pem"
+
+
+@patch("builtins.print")
+def test_validate_many(mock_print):
+    """Test validating many variations in one pass."""
+    client = LaunchDarklyClient("fake-key", "fake-project")
+    variations = [
+        {"name": "Production", "value": {"tcp_port": 443}},
+        {"name": "Development", "value": {"tcp_port": 8080}},
+    ]
+
+    # Valid case
+    assert client.validate_many(iter(variations)) == variations
+    mock_print.assert_called_once_with(
+        "✅ Variation 1 is valid\n✅ Variation 2 is valid"
+    )
+
+    # Invalid case
+    variations.append({"name": "Broken", "value": {"tcp_port": 70000}})
+    with pytest.raises(
+        ValueError,
+        match="Validation failed for variation 3: tcp_port must be between 0 and 65535",
+    ):
+        client.validate_many(variations)
+
+    # Empty case
+    with pytest.raises(ValueError, match="At least one variation is required"):
+        client.validate_many(iter([]))
+
+
+@responses.activate
+def test_get_projects():
+    """Test getting projects."""
+    # Setup
+    responses.get(
         "https://app.launchdarkly.com/api/v2/projects",
-        headers={"Authorization": "fake-key", "Content-Type": "application/json"},
+        json={
+            "items": [
+                {"key": "project1", "name": "Project 1"},
+                {"key": "project2", "name": "Project 2"},
+            ],
+            "_links": {
+                "next": {"href": "https://app.launchdarkly.com/api/v2/projects?page=2"}
+            },
+        },
     )
-    mock_get.assert_any_call(
+    responses.get(
         "https://app.launchdarkly.com/api/v2/projects?page=2",
-        headers={"Authorization": "fake-key", "Content-Type": "application/json"},
+        json={
+            "items": [{"key": "project3", "name": "Project 3"}],
+            "_links": {},  # No next page
+        },
     )
 
+    # Call the function
+    client = LaunchDarklyClient("fake-key")
+    projects = client.get_projects()
+
+    # Assertions
+    assert [c.request.url for c in responses.calls] == [
+        "https://app.launchdarkly.com/api/v2/projects",
+        "https://app.launchdarkly.com/api/v2/projects?page=2",
+    ]
+
     # Check that all items from both pages are returned
     assert len(projects) == 3
     assert projects[0]["key"] == "project1"
@@ -78,18 +143,59 @@ def test_get_projects(mock_get):
     assert projects[2]["key"] == "project3"
 
 
-@patch("requests.get")
-def test_get_environments(mock_get):
+@pytest.mark.parametrize(
+    "links",
+    [{}, {"next": None}, {"next": {}}, {"next": {"href": None}}, None],
+)
+@patch("requests.Session.get")
+def test_get_projects_last_page_links(mock_get, links, make_response):
+    """Test that missing or empty 'next' links end pagination."""
+    # Setup
+    response = make_response({"items": [{"key": "project1"}], "_links": links})
+    mock_get.return_value = response
+
+    # Call the function
+    client = LaunchDarklyClient("fake-key")
+    projects = client.get_projects()
+
+    # Assertions
+    assert mock_get.call_count == 1
+    assert projects == [{"key": "project1"}]
+
+
+@patch("requests.Session.get")
+def test_project_key_change_updates_urls(mock_get, make_response):
+    """Test that changing the project key is reflected in request URLs."""
+    mock_response = make_response({"key": "test-flag"})
+    mock_get.return_value = mock_response
+
+    # Test function
+    client = LaunchDarklyClient("fake-key")
+    client.project_key = "new-project"
+    client.get_feature_flag("test-flag")
+    client.get_feature_flag("test-flag", "other-project")
+
+    # Assertions
+    mock_get.assert_any_call(
+        "https://app.launchdarkly.com/api/v2/flags/new-project/test-flag"
+    )
+    mock_get.assert_any_call(
+        "https://app.launchdarkly.com/api/v2/flags/other-project/test-flag"
+    )
+
+
+@patch("requests.Session.get")
+def test_get_environments(mock_get, make_response):
     """Test getting environments."""
     # Mock response
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {
-        "environments": [
-            {"key": "production", "name": "Production"},
-            {"key": "staging", "name": "Staging"},
-        ]
-    }
+    mock_response = make_response(
+        {
+            "environments": [
+                {"key": "production", "name": "Production"},
+                {"key": "staging", "name": "Staging"},
+            ]
+        }
+    )
     mock_get.return_value = mock_response
 
     # Test function
@@ -98,78 +204,375 @@ def test_get_environments(mock_get):
 
     # Assertions
     mock_get.assert_called_once_with(
-        "https://app.launchdarkly.com/api/v2/projects/test-project",
-        headers={"Authorization": "fake-key", "Content-Type": "application/json"},
+        "https://app.launchdarkly.com/api/v2/projects/test-project"
     )
     assert len(environments) == 2
     assert environments[0]["key"] == "production"
     assert environments[1]["name"] == "Staging"
 
 
-@patch("requests.get")
-def test_get_feature_flags(mock_get):
+@responses.activate
+def test_get_feature_flags():
     """Test getting feature flags."""
-    # Mock responses for pagination
-    first_page_response = MagicMock()
-    first_page_response.status_code = 200
-    first_page_response.json.return_value = {
-        "items": [
-            {"key": "flag1", "name": "Flag 1", "kind": "json"},
-            {"key": "flag2", "name": "Flag 2", "kind": "boolean"},
-        ],
-        "_links": {
-            "next": {
-                "href": "https://app.launchdarkly.com/api/v2/flags/test-project?page=2"
-            }
+    # Setup
+    responses.get(
+        "https://app.launchdarkly.com/api/v2/flags/test-project",
+        json={
+            "items": [
+                {"key": "flag1", "name": "Flag 1", "kind": "json"},
+                {"key": "flag2", "name": "Flag 2", "kind": "boolean"},
+            ],
+            "_links": {
+                "next": {
+                    "href": "https://app.launchdarkly.com/api/v2/flags/test-project?page=2"
+                }
+            },
         },
-    }
+    )
+    responses.get(
+        "https://app.launchdarkly.com/api/v2/flags/test-project?page=2",
+        json={
+            "items": [
+                {"key": "flag3", "name": "Flag 3", "kind": "json"},
+            ],
+            "_links": {},  # No next page
+        },
+    )
 
-    second_page_response = MagicMock()
-    second_page_response.status_code = 200
-    second_page_response.json.return_value = {
-        "items": [
-            {"key": "flag3", "name": "Flag 3", "kind": "json"},
-        ],
-        "_links": {},  # No next page
+    # Call the function
+    client = LaunchDarklyClient("fake-key", "test-project")
+    flags = client.get_feature_flags()
+
+    # Assertions
+    assert [c.request.url for c in responses.calls] == [
+        "https://app.launchdarkly.com/api/v2/flags/test-project",
+        "https://app.launchdarkly.com/api/v2/flags/test-project?page=2",
+    ]
+
+    # Check that all items from both pages are returned
+    assert len(flags) == 3
+    assert flags[0]["key"] == "flag1"
+    assert flags[1]["kind"] == "boolean"
+    assert flags[2]["key"] == "flag3"
+
+
+@patch("requests.Session.get")
+def test_get_feature_flags_includes_variations(mock_get, make_response):
+    """Test that the default listing is requested and keeps each flag's variations."""
+    # Setup
+    response = make_response(
+        {"items": [{"key": "flag1", "variations": [{"value": {"tcp_port": 443}}]}]}
+    )
+    mock_get.return_value = response
+
+    # Call the function
+    client = LaunchDarklyClient("fake-key", "test-project")
+    flags = client.get_feature_flags()
+
+    # Assertions
+    mock_get.assert_called_once_with(
+        "https://app.launchdarkly.com/api/v2/flags/test-project"
+    )
+    assert flags[0]["variations"][0]["value"] == {"tcp_port": 443}
+
+
+@patch("requests.Session.get")
+def test_get_feature_flags_concurrent_pages(mock_get, make_response):
+    """Test fetching the remaining pages concurrently when the last page is known."""
+    base = "https://app.launchdarkly.com/api/v2/flags/test-project"
+    links = {
+        "next": {"href": "/api/v2/flags/test-project?limit=2&offset=2"},
+        "last": {"href": "/api/v2/flags/test-project?limit=2&offset=4"},
     }
+    pages = {
+        base: {"items": [{"key": "flag1"}, {"key": "flag2"}], "_links": links},
+        f"{base}?limit=2&offset=2": {"items": [{"key": "flag3"}, {"key": "flag4"}]},
+        f"{base}?limit=2&offset=4": {"items": [{"key": "flag5"}]},
+    }
+
+    def get_side_effect(url):
+        response = make_response(pages[url])
+        return response
 
-    # Configure mock to return different responses for different URLs
-    mock_get.side_effect = [first_page_response, second_page_response]
+    mock_get.side_effect = get_side_effect
 
     # Test function
     client = LaunchDarklyClient("fake-key", "test-project")
     flags = client.get_feature_flags()
 
     # Assertions
+    assert mock_get.call_count == 3
+    assert [flag["key"] for flag in flags] == [
+        "flag1",
+        "flag2",
+        "flag3",
+        "flag4",
+        "flag5",
+    ]
+
+
+@patch("requests.Session.get")
+def test_prefetch(mock_get, make_response):
+    """Test that a read made during a prefetch waits for it instead of refetching."""
+    # Setup
+    release = threading.Event()
+    response = make_response(
+        {"environments": [{"key": "production", "name": "Production"}]}
+    )
+
+    def get(url):
+        release.wait(5)
+        return response
+
+    mock_get.side_effect = get
+    client = LaunchDarklyClient("fake-key", "test-project", cache_reads=True)
+
+    # Call the function while the prefetch is still blocked
+    future = client.prefetch("get_environments", "test-project")
+    threading.Timer(0.05, release.set).start()
+    environments = client.get_environments("test-project")
+
+    # Assertions
+    assert environments == [{"key": "production", "name": "Production"}]
+    assert future.result() == environments
+    assert future.result() is not environments
+    assert client.get_environments("test-project") == environments
+    mock_get.assert_called_once_with(
+        "https://app.launchdarkly.com/api/v2/projects/test-project"
+    )
+
+
+@patch("builtins.print")
+@patch("requests.Session.get")
+def test_prefetch_error(mock_get, mock_print, make_response):
+    """Test that a failed prefetch stays quiet and is retried by the next read."""
+    # Setup
+    failed = make_response({"message": "Forbidden"}, status=403)
+    failed.raise_for_status = MagicMock(side_effect=requests.HTTPError("403"))
+    response = make_response({"environments": []})
+    mock_get.side_effect = [failed, response]
+    client = LaunchDarklyClient("fake-key", "test-project")
+
+    # Call the function
+    future = client.prefetch("get_environments")
+    with pytest.raises(requests.HTTPError):
+        future.result(timeout=5)
+    mock_print.assert_not_called()
+    environments = client.get_environments()
+
+    # Assertions
+    assert environments == []
     assert mock_get.call_count == 2
-    mock_get.assert_any_call(
+
+
+@patch("builtins.print")
+def test_captured_output(mock_print):
+    """Test collecting the client's messages instead of printing them."""
+    client = LaunchDarklyClient("fake-key", "test-project")
+
+    with client.captured_output() as lines:
+        client.validate_many([{"value": {"tcp_port": 443}}])
+
+    assert lines == ["✅ Variation 1 is valid"]
+    mock_print.assert_not_called()
+
+
+@patch("ld_json_flag.client.time.monotonic")
+@patch("requests.Session.get")
+def test_get_feature_flag_etag_304(mock_get, mock_monotonic, make_response):
+    """Test that an unchanged flag is revalidated by ETag from the stored body."""
+    # Setup
+    first_response = make_response({"key": "test-flag"}, headers={"ETag": '"abc123"'})
+    not_modified = make_response(None, status=304, headers={"ETag": '"abc123"'})
+    mock_get.side_effect = [first_response, not_modified]
+    mock_monotonic.return_value = 100.0
+    client = LaunchDarklyClient("fake-key", "test-project")
+    url = "https://app.launchdarkly.com/api/v2/flags/test-project/test-flag"
+
+    # Call the function, letting the read cache expire between calls
+    flag = client.get_feature_flag("test-flag")
+    flag["key"] = "edited-locally"
+    mock_monotonic.return_value = 100.0 + CACHE_TTL
+    revalidated = client.get_feature_flag("test-flag")
+
+    # Assertions
+    assert revalidated == {"key": "test-flag"}
+    assert mock_get.call_args_list == [
+        call(url),
+        call(url, headers={"If-None-Match": '"abc123"'}),
+    ]
+
+
+@patch("ld_json_flag.client.time.monotonic")
+@patch("requests.Session.get")
+def test_get_feature_flags_etag_changed(mock_get, mock_monotonic, make_response):
+    """Test that a changed page replaces the stored copy."""
+    # Setup
+    old_page = make_response({"items": [{"key": "flag1"}]}, headers={"ETag": '"v1"'})
+    new_page = make_response({"items": [{"key": "flag2"}]}, headers={"ETag": '"v2"'})
+    mock_get.side_effect = [old_page, new_page]
+    mock_monotonic.return_value = 100.0
+    client = LaunchDarklyClient("fake-key", "test-project")
+
+    # Call the function
+    assert client.get_feature_flags() == [{"key": "flag1"}]
+    mock_monotonic.return_value = 100.0 + CACHE_TTL
+    assert client.get_feature_flags() == [{"key": "flag2"}]
+
+    # Assertions
+    assert mock_get.call_args == call(
         "https://app.launchdarkly.com/api/v2/flags/test-project",
-        headers={"Authorization": "fake-key", "Content-Type": "application/json"},
+        headers={"If-None-Match": '"v1"'},
     )
-    mock_get.assert_any_call(
-        "https://app.launchdarkly.com/api/v2/flags/test-project?page=2",
-        headers={"Authorization": "fake-key", "Content-Type": "application/json"},
+
+
+@patch("requests.Session.get")
+def test_clear_cache_drops_etags(mock_get, make_response):
+    """Test that clearing the cache (as every write does) drops stored ETags."""
+    # Setup
+    response = make_response({"key": "test-flag"}, headers={"ETag": '"abc123"'})
+    mock_get.return_value = response
+    client = LaunchDarklyClient("fake-key", "test-project")
+    url = "https://app.launchdarkly.com/api/v2/flags/test-project/test-flag"
+
+    # Call the function
+    client.get_feature_flag("test-flag")
+    client.clear_cache()
+    client.get_feature_flag("test-flag")
+
+    # Assertions
+    assert mock_get.call_args_list == [call(url), call(url)]
+
+
+@patch("ld_json_flag.client.MAX_ETAG_ENTRIES", 2)
+@patch("requests.Session.get")
+def test_etag_store_evicts_least_recently_used(mock_get, make_response):
+    """Test that the ETag store is capped, dropping the least recently used URL."""
+    # Setup
+    mock_get.side_effect = lambda url, **kwargs: make_response(
+        {"key": url.rsplit("/", 1)[1]}, headers={"ETag": '"v1"'}
     )
+    client = LaunchDarklyClient("fake-key", "test-project")
+    base = "https://app.launchdarkly.com/api/v2/flags/test-project"
 
-    # Check that all items from both pages are returned
-    assert len(flags) == 3
-    assert flags[0]["key"] == "flag1"
-    assert flags[1]["kind"] == "boolean"
-    assert flags[2]["key"] == "flag3"
+    # Call the function
+    client._get_json(f"{base}/flag1", "fetching flag")
+    client._get_json(f"{base}/flag2", "fetching flag")
+    client._get_json(f"{base}/flag1", "fetching flag")
+    client._get_json(f"{base}/flag3", "fetching flag")
 
+    # Assertions
+    assert list(client._etags) == [f"{base}/flag1", f"{base}/flag3"]
 
-@patch("requests.get")
-def test_get_feature_flag(mock_get):
-    """Test getting a specific feature flag."""
-    # Mock response
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {
+
+@patch("requests.Session.get")
+def test_read_cache_off_by_default(mock_get, make_response):
+    """Test that clients only cache reads when created with cache_reads=True."""
+    # Setup
+    mock_get.return_value = make_response({"key": "test-flag"})
+    client = LaunchDarklyClient("fake-key", "test-project")
+
+    # Call the function
+    client.get_feature_flag("test-flag")
+    client.get_feature_flag("test-flag")
+
+    # Assertions
+    assert mock_get.call_count == 2
+
+
+@patch("ld_json_flag.client.time.monotonic")
+@patch("requests.Session.get")
+def test_read_cache(mock_get, mock_monotonic, make_response):
+    """Test that reads are cached until they expire or a write happens."""
+    # Setup
+    response = make_response({"key": "test-flag", "variations": []})
+    mock_get.return_value = response
+    mock_monotonic.return_value = 100.0
+    client = LaunchDarklyClient("fake-key", "test-project", cache_reads=True)
+
+    # Repeated reads within the TTL are served from the cache
+    first = client.get_feature_flag("test-flag")
+    first["variations"].append({"value": {"tcp_port": 1}})
+    assert client.get_feature_flag("test-flag") == {
         "key": "test-flag",
-        "name": "Test Flag",
-        "kind": "json",
-        "variations": [{"name": "Production", "value": {"tcp_port": 443}}],
+        "variations": [],
     }
+    assert mock_get.call_count == 1
+
+    # Different arguments are cached separately
+    client.get_feature_flag("test-flag", "other-project")
+    assert mock_get.call_count == 2
+
+    # Expired entries are fetched again
+    mock_monotonic.return_value = 100.0 + CACHE_TTL
+    client.get_feature_flag("test-flag")
+    assert mock_get.call_count == 3
+
+    # Writes invalidate the cache
+    with patch("requests.Session.patch", return_value=response), patch(
+        "builtins.print"
+    ):
+        client.update_flag_variations(
+            "test-flag", [{"name": "Production", "value": {"tcp_port": 443}}]
+        )
+    client.get_feature_flag("test-flag")
+    assert mock_get.call_count == 4
+
+
+@patch("requests.Session.patch")
+@patch("requests.Session.get")
+def test_failed_write_clears_cache(mock_get, mock_patch, make_response):
+    """Test that a write that raises still invalidates cached reads."""
+    # Setup
+    mock_get.return_value = make_response({"key": "test-flag", "variations": []})
+    mock_patch.side_effect = requests.exceptions.ConnectionError("down")
+    client = LaunchDarklyClient("fake-key", "test-project")
+
+    # Call the function
+    client.get_feature_flag("test-flag")
+    with pytest.raises(requests.exceptions.ConnectionError), patch("builtins.print"):
+        client.update_flag_variations(
+            "test-flag", [{"name": "Production", "value": {"tcp_port": 443}}]
+        )
+    client.get_feature_flag("test-flag")
+
+    # Assertions
+    assert mock_get.call_count == 2
+
+
+@patch("builtins.print")
+@patch("requests.Session.get")
+def test_get_feature_flag_error(mock_get, mock_print):
+    """Test that a failed request is reported and raised."""
+    mock_response = MagicMock()
+    mock_response.status_code = 404
+    mock_response.text = "Not found"
+    mock_response.raise_for_status.side_effect = requests.HTTPError("404")
+    mock_get.return_value = mock_response
+
+    # Test function
+    client = LaunchDarklyClient("fake-key", "test-project")
+    with pytest.raises(requests.HTTPError):
+        client.get_feature_flag("missing-flag")
+
+    # Assertions
+    printed = {c.args[0] for c in mock_print.call_args_list if c.args}
+    assert "❌ Error getting feature flag details: 404" in printed
+    assert "Response: Not found" in printed
+
+
+@patch("requests.Session.get")
+def test_get_feature_flag(mock_get, make_response):
+    """Test getting a specific feature flag."""
+    # Mock response
+    mock_response = make_response(
+        {
+            "key": "test-flag",
+            "name": "Test Flag",
+            "kind": "json",
+            "variations": [{"name": "Production", "value": {"tcp_port": 443}}],
+        }
+    )
     mock_get.return_value = mock_response
 
     # Test function
@@ -178,25 +581,25 @@ def test_get_feature_flag(mock_get):
 
     # Assertions
     mock_get.assert_called_once_with(
-        "https://app.launchdarkly.com/api/v2/flags/test-project/test-flag",
-        headers={"Authorization": "fake-key", "Content-Type": "application/json"},
+        "https://app.launchdarkly.com/api/v2/flags/test-project/test-flag"
     )
     assert flag["key"] == "test-flag"
     assert flag["variations"][0]["value"]["tcp_port"] == 443
 
 
-@patch("requests.post")
-def test_create_feature_flag(mock_post):
+@responses.activate
+def test_create_feature_flag():
     """Test creating a feature flag."""
-    # Mock response
-    mock_response = MagicMock()
-    mock_response.status_code = 201
-    mock_response.json.return_value = {
-        "key": "test-flag",
-        "name": "Test Flag",
-        "kind": "json",
-    }
-    mock_post.return_value = mock_response
+    # Setup
+    responses.post(
+        "https://app.launchdarkly.com/api/v2/flags/test-project",
+        json={
+            "key": "test-flag",
+            "name": "Test Flag",
+            "kind": "json",
+        },
+        status=201,
+    )
 
     # Test data
     variations = [
@@ -212,21 +615,17 @@ def test_create_feature_flag(mock_post):
         },
     ]
 
-    # Test function
+    # Call the function
     client = LaunchDarklyClient("fake-key", "test-project")
     result = client.create_feature_flag("test-flag", "Test Flag", variations)
 
     # Assertions
-    mock_post.assert_called_once()
-    call_args = mock_post.call_args
-    assert call_args[0][0] == "https://app.launchdarkly.com/api/v2/flags/test-project"
-    assert call_args[1]["headers"] == {
-        "Authorization": "fake-key",
-        "Content-Type": "application/json",
-    }
+    assert len(responses.calls) == 1
+    request = responses.calls[0].request
+    assert request.headers["Authorization"] == "fake-key"
 
     # Check payload
-    payload = call_args[1]["json"]
+    payload = json.loads(request.body)
     assert payload["key"] == "test-flag"
     assert payload["name"] == "Test Flag"
     assert payload["kind"] == "json"
@@ -238,17 +637,111 @@ def test_create_feature_flag(mock_post):
     assert result["key"] == "test-flag"
 
 
-@patch("requests.patch")
-def test_update_flag_variations(mock_patch):
+def test_load_variations(tmp_path):
+    """Test loading variations from a JSON file."""
+    variations_file = tmp_path / "variations.json"
+    variations_file.write_text(
+        '[{"name": "Production", "value": {"tcp_port": 443}},'
+        ' {"name": "Development", "value": {"tcp_port": 8080}}]'
+    )
+
+    # Test function
+    variations = LaunchDarklyClient.load_variations(str(variations_file))
+
+    # Assertions
+    assert [v["value"]["tcp_port"] for v in variations] == [443, 8080]
+
+
+def test_load_variations_missing_file(tmp_path):
+    """Test that a missing variations file is reported."""
+    with pytest.raises(OSError):
+        LaunchDarklyClient.load_variations(str(tmp_path / "missing.json"))
+
+
+def test_load_variations_too_large(tmp_path, monkeypatch):
+    """Test that an oversized variations file is rejected before parsing."""
+    # Setup
+    monkeypatch.setattr(jsonutil, "MAX_FILE_SIZE", 8)
+    path = tmp_path / "variations.json"
+    path.write_text('[{"value": {"tcp_port": 443}}]')
+
+    # Call the function
+    with pytest.raises(ValueError, match="is too large"):
+        LaunchDarklyClient.load_variations(str(path))
+
+
+@pytest.mark.parametrize(
+    "content, message",
+    [
+        ('{"value": {"tcp_port": 443}}', "must contain a JSON array"),
+        ("", "Invalid JSON"),
+        ('[{"value": ', "Invalid JSON"),
+    ],
+    ids=["object", "empty", "truncated"],
+)
+def test_load_variations_rejects_non_array(tmp_path, content, message):
+    """Test that a file that isn't a JSON array is rejected."""
+    # Setup
+    path = tmp_path / "variations.json"
+    path.write_text(content)
+
+    # Call the function
+    with pytest.raises(ValueError, match=message):
+        LaunchDarklyClient.load_variations(str(path))
+
+
+@patch("requests.Session.post")
+def test_create_feature_flag_from_stream(mock_post, make_response):
+    """Test creating a feature flag from a stream of variations."""
+    mock_response = make_response({"key": "test-flag"}, status=201)
+    mock_post.return_value = mock_response
+
+    variations = (
+        {"name": name, "value": {"tcp_port": port}}
+        for name, port in [("Production", 443), ("Development", 8080)]
+    )
+
+    # Test function
+    client = LaunchDarklyClient("fake-key", "test-project")
+    client.create_feature_flag("test-flag", "Test Flag", variations)
+
+    # Assertions
+    payload = json.loads(mock_post.call_args[1]["data"])
+    assert [v["name"] for v in payload["variations"]] == ["Production", "Development"]
+
+
+@patch("builtins.print")
+@patch("requests.Session.post")
+def test_create_feature_flag_verbose(mock_post, mock_print, make_response):
+    """Test that the payload is only printed in verbose mode."""
+    mock_response = make_response({"key": "test-flag"}, status=201)
+    mock_post.return_value = mock_response
+    variations = [{"name": "Production", "value": {"tcp_port": 443}}]
+    message = "Creating feature flag with the following configuration:"
+
+    # Test function
+    client = LaunchDarklyClient("fake-key", "test-project")
+    client.create_feature_flag("test-flag", "Test Flag", variations)
+    assert call(message) not in mock_print.call_args_list
+
+    verbose_client = LaunchDarklyClient("fake-key", "test-project", verbose=True)
+    verbose_client.create_feature_flag("test-flag", "Test Flag", variations)
+
+    # Assertions
+    mock_print.assert_any_call(message)
+
+
+@patch("requests.Session.patch")
+def test_update_flag_variations(mock_patch, make_response):
     """Test updating flag variations."""
     # Mock response
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {
-        "key": "test-flag",
-        "name": "Test Flag",
-        "kind": "json",
-    }
+    mock_response = make_response(
+        {
+            "key": "test-flag",
+            "name": "Test Flag",
+            "kind": "json",
+        }
+    )
     mock_patch.return_value = mock_response
 
     # Test data
@@ -276,13 +769,9 @@ def test_update_flag_variations(mock_patch):
         call_args[0][0]
         == "https://app.launchdarkly.com/api/v2/flags/test-project/test-flag"
     )
-    assert call_args[1]["headers"] == {
-        "Authorization": "fake-key",
-        "Content-Type": "application/json",
-    }
 
     # Check payload
-    payload = call_args[1]["json"]
+    payload = json.loads(call_args[1]["data"])
     assert payload["comment"] == "Updated flag variations via LD JSON Flag Utility"
     assert payload["patch"][0]["op"] == "replace"
     assert payload["patch"][0]["path"] == "/variations"
@@ -294,17 +783,17 @@ def test_update_flag_variations(mock_patch):
     assert result["key"] == "test-flag"
 
 
-@patch("requests.patch")
-def test_configure_environment_targeting(mock_patch):
+@patch("requests.Session.patch")
+def test_configure_environment_targeting(mock_patch, make_response):
     """Test configuring environment targeting."""
     # Mock response
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {
-        "key": "test-flag",
-        "name": "Test Flag",
-        "kind": "json",
-    }
+    mock_response = make_response(
+        {
+            "key": "test-flag",
+            "name": "Test Flag",
+            "kind": "json",
+        }
+    )
     mock_patch.return_value = mock_response
 
     # Test data
@@ -329,13 +818,9 @@ def test_configure_environment_targeting(mock_patch):
         call_args[0][0]
         == "https://app.launchdarkly.com/api/v2/flags/test-project/test-flag/environments/production"
     )
-    assert call_args[1]["headers"] == {
-        "Authorization": "fake-key",
-        "Content-Type": "application/json",
-    }
 
     # Check payload
-    payload = call_args[1]["json"]
+    payload = json.loads(call_args[1]["data"])
     assert payload["instructions"][0]["kind"] == "replaceRule"
     assert len(payload["instructions"][0]["rules"]) == 1
     assert payload["instructions"][0]["rules"][0]["description"] == "Test rule"
@@ -349,20 +834,27 @@ def test_configure_environment_targeting(mock_patch):
 @patch("ld_json_flag.interactive.edit_json_in_editor")
 @patch("ld_json_flag.interactive.input")
 @patch("builtins.print")
-def test_validate_flags_workflow_valid_flags(mock_print, mock_input, mock_editor):
+def test_validate_flags_workflow_valid_flags(
+    mock_print, mock_input, mock_editor, client
+):
     """Test validating flags when all flags are valid."""
-    # Create a mock client
-    client = MagicMock()
-
     # Mock client.get_feature_flags to return a list of flags
-    client.get_feature_flags.return_value = [{"key": "flag1", "name": "Flag 1"}]
+    client.get_feature_flags.return_value = [
+        {"key": "flag1", "name": "Flag 1"},
+        {"key": "flag2", "name": "Flag 2"},
+    ]
 
-    # Mock client.get_feature_flag to return flag details
-    client.get_feature_flag.return_value = {
-        "key": "flag1",
-        "name": "Flag 1",
-        "variations": [{"name": "Variation 1", "value": {"tcp_port": 443}}],
+    # Mock client.get_feature_flag to return flag details; the details are
+    # fetched concurrently, so answer by key rather than by call order
+    flag_details = {
+        key: {
+            "key": key,
+            "name": key.title(),
+            "variations": [{"name": "Variation 1", "value": {"tcp_port": 443}}],
+        }
+        for key in ("flag1", "flag2")
     }
+    client.get_feature_flag.side_effect = lambda key, project_key: flag_details[key]
 
     # Mock client.validate_tcp_port_json to always return True (valid)
     client.validate_tcp_port_json.return_value = True
@@ -378,8 +870,11 @@ def test_validate_flags_workflow_valid_flags(mock_print, mock_input, mock_editor
     # Assertions
     assert result is True
     client.get_feature_flags.assert_called_once_with("test-project")
-    client.get_feature_flag.assert_called_once_with("flag1", "test-project")
-    client.validate_tcp_port_json.assert_called_once()
+    assert {c.args for c in client.get_feature_flag.call_args_list} == {
+        ("flag1", "test-project"),
+        ("flag2", "test-project"),
+    }
+    assert client.validate_tcp_port_json.call_count == 2
 
     # Check that the success message was printed
     mock_print.assert_any_call("\n✅ All JSON feature flags are valid!")
@@ -389,12 +884,9 @@ def test_validate_flags_workflow_valid_flags(mock_print, mock_input, mock_editor
 @patch("ld_json_flag.interactive.input")
 @patch("builtins.print")
 def test_validate_flags_workflow_invalid_flags_no_fix(
-    mock_print, mock_input, mock_editor
+    mock_print, mock_input, mock_editor, client
 ):
     """Test validating flags when there are invalid flags but fix is not enabled."""
-    # Create a mock client
-    client = MagicMock()
-
     # Mock client.get_feature_flags to return a list of flags
     client.get_feature_flags.return_value = [{"key": "flag1", "name": "Flag 1"}]
 
@@ -432,20 +924,18 @@ def test_validate_flags_workflow_invalid_flags_no_fix(
     client.validate_tcp_port_json.assert_called_once()
 
     # Check that the error message was printed
-    mock_print.assert_any_call("\n❌ Found 1 invalid JSON feature flags.")
-    mock_print.assert_any_call("Run with --fix to fix invalid flags.")
+    printed = {c.args[0] for c in mock_print.call_args_list if c.args}
+    assert "\n❌ Found 1 invalid JSON feature flags." in printed
+    assert "Run with --fix to fix invalid flags." in printed
 
 
 @patch("ld_json_flag.interactive.edit_json_in_editor")
 @patch("ld_json_flag.interactive.input")
 @patch("builtins.print")
 def test_validate_flags_workflow_invalid_flags_with_fix(
-    mock_print, mock_input, mock_editor
+    mock_print, mock_input, mock_editor, client
 ):
     """Test validating and fixing invalid flags."""
-    # Create a mock client
-    client = MagicMock()
-
     # Mock client.get_feature_flags to return a list of flags
     client.get_feature_flags.return_value = [{"key": "flag1", "name": "Flag 1"}]
 
@@ -495,6 +985,48 @@ def test_validate_flags_workflow_invalid_flags_with_fix(
     client.update_flag_variations.assert_called_once()
 
     # Check that the success message was printed
-    mock_print.assert_any_call("\n❌ Found 1 invalid JSON feature flags.")
-    mock_print.assert_any_call("\nFixing invalid flags...")
+    printed = {c.args[0] for c in mock_print.call_args_list if c.args}
+    assert "\n❌ Found 1 invalid JSON feature flags." in printed
+    assert "\nFixing invalid flags..." in printed
+    assert "✅ Successfully updated variations for flag 'flag1'" in printed
+
+
+@patch("ld_json_flag.interactive.edit_json_in_editor")
+@patch("ld_json_flag.interactive.input")
+@patch("builtins.print")
+def test_validate_flags_workflow_fix_interrupted(
+    mock_print, mock_input, mock_editor, client
+):
+    """Test that fixes confirmed before an interrupt are still applied."""
+    # Setup
+    client.get_feature_flags.return_value = [
+        {"key": "flag1", "name": "Flag 1"},
+        {"key": "flag2", "name": "Flag 2"},
+    ]
+    client.get_feature_flag.side_effect = lambda flag_key, project_key: {
+        "key": flag_key,
+        "variations": [{"name": "Variation 1", "value": {"tcp_port": "invalid"}}],
+    }
+
+    def validate_side_effect(value):
+        if value == {"tcp_port": "invalid"}:
+            raise ValueError("tcp_port must be an integer")
+        return True
+
+    client.validate_tcp_port_json.side_effect = validate_side_effect
+    fixed = [{"name": "Variation 1", "value": {"tcp_port": 443}}]
+    mock_editor.return_value = fixed
+    mock_input.side_effect = ["y", KeyboardInterrupt]
+    client.project_key = "test-project"
+
+    # Call the function
+    from ld_json_flag.interactive import validate_flags_workflow
+
+    with pytest.raises(KeyboardInterrupt):
+        validate_flags_workflow(client, fix_invalid=True)
+
+    # Assertions
+    client.update_flag_variations.assert_called_once_with(
+        "flag1", fixed, "test-project"
+    )
     mock_print.assert_any_call("✅ Successfully updated variations for flag 'flag1'")
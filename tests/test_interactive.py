@@ -1,91 +1,76 @@
 """Tests for the interactive functionality."""
 
-from unittest.mock import patch, MagicMock, call
+import threading
+import time
+from unittest.mock import DEFAULT, patch, MagicMock, call
 import pytest
 from ld_json_flag.interactive import (
     select_from_list,
+    suggest_flag_key,
     select_project,
     select_flag,
+    has_json_variation,
+    fetch_flag_details,
     edit_json_in_editor,
+    find_invalid_variations,
+    preview_value,
+    format_variations,
     update_flag_variations_workflow,
     create_flag_workflow,
+    apply_env_rules,
+    apply_flag_updates,
+    build_template_variations,
     interactive_workflow,
     validate_flags_workflow,
 )
-
-
-@patch("builtins.input")
-@patch("builtins.print")
-def test_select_from_list_valid_choice(mock_print, mock_input):
-    """Test selecting a valid item from a list."""
-    # Setup
-    items = ["item1", "item2", "item3"]
-    mock_input.return_value = "2"  # Select the second item
-
-    # Call the function
-    result = select_from_list(items, "Select an item:")
-
-    # Assertions
-    assert result == "item2"
-    mock_print.assert_any_call("Select an item:")
-    mock_print.assert_any_call("1. item1")
-    mock_print.assert_any_call("2. item2")
-    mock_print.assert_any_call("3. item3")
-
-
-@patch("builtins.input")
-@patch("builtins.print")
-def test_select_from_list_quit(mock_print, mock_input):
-    """Test quitting the selection."""
-    # Setup
-    items = ["item1", "item2", "item3"]
-    mock_input.return_value = "q"  # Quit
-
-    # Call the function
-    result = select_from_list(items, "Select an item:")
-
-    # Assertions
-    assert result is None
-    mock_print.assert_any_call("Select an item:")
-
-
-@patch("builtins.input")
-@patch("builtins.print")
-def test_select_from_list_invalid_choice(mock_print, mock_input):
-    """Test selecting an invalid item from a list."""
-    # Setup
-    items = ["item1", "item2", "item3"]
-    mock_input.side_effect = ["4", "2"]  # First invalid, then valid
-
-    # Call the function
-    result = select_from_list(items, "Select an item:")
-
-    # Assertions
-    assert result == "item2"
-    mock_print.assert_any_call("Please enter a number between 1 and 3")
-
-
-@patch("builtins.input")
-@patch("builtins.print")
-def test_select_from_list_non_numeric(mock_print, mock_input):
-    """Test entering a non-numeric value."""
+from ld_json_flag.client import LaunchDarklyClient
+
+
+@pytest.mark.parametrize(
+    "inputs, expected, errors",
+    [
+        (["2"], "item2", []),
+        (["q"], None, []),
+        (["4", "2"], "item2", ["Please enter a number between 1 and 3"]),
+        (["abc", "2"], "item2", ["Please enter a valid number"]),
+    ],
+    ids=["valid_choice", "quit", "invalid_choice", "non_numeric"],
+)
+def test_select_from_list(monkeypatch, capsys, inputs, expected, errors):
+    """Test selecting from a list, quitting, and re-prompting on bad input."""
     # Setup
     items = ["item1", "item2", "item3"]
-    mock_input.side_effect = ["abc", "2"]  # First non-numeric, then valid
+    answers = iter(inputs)
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
 
     # Call the function
     result = select_from_list(items, "Select an item:")
 
     # Assertions
-    assert result == "item2"
-    mock_print.assert_any_call("Please enter a valid number")
+    assert result == expected
+    assert next(answers, None) is None
+    menu = "Select an item:\n1. item1\n2. item2\n3. item3\n"
+    assert capsys.readouterr().out == menu + "".join(f"{e}\n" for e in errors)
+
+
+@pytest.mark.parametrize(
+    "flag_name, expected",
+    [
+        ("Test Flag", "test-flag"),
+        ("TCP Port Config 2", "tcp-port-config-2"),
+        ("already-a-key", "already-a-key"),
+        ("Ünïcode Flag", "ünïcode-flag"),
+    ],
+)
+def test_suggest_flag_key(flag_name, expected):
+    """Test suggesting a flag key from a flag name."""
+    assert suggest_flag_key(flag_name) == expected
 
 
 @patch("ld_json_flag.interactive.select_from_list")
-def test_select_project(mock_select_from_list):
+def test_select_project(mock_select_from_list, client):
     """Test selecting a project."""
     # Setup
-    client = MagicMock()
     client.get_projects.return_value = [
         {"key": "project1", "name": "Project 1"},
         {"key": "project2", "name": "Project 2"},
@@ -102,18 +87,17 @@ def test_select_project(mock_select_from_list):
 
 
 @patch("ld_json_flag.interactive.select_from_list")
-def test_select_flag(mock_select_from_list):
+def test_select_flag(mock_select_from_list, client):
     """Test selecting a flag."""
     # Setup
-    client = MagicMock()
     client.get_feature_flags.return_value = [
-        {"key": "flag1", "name": "Flag 1"},
-        {"key": "flag2", "name": "Flag 2"},
+        {"key": "flag1", "name": "Flag 1", "variations": [{"value": True}]},
+        {
+            "key": "flag2",
+            "name": "Flag 2",
+            "variations": [{"value": {"tcp_port": 443}}],
+        },
     ]
-    client.get_feature_flag.side_effect = lambda key, project_key: {
-        "flag1": {"key": "flag1", "variations": [{"value": {}}]},
-        "flag2": {"key": "flag2", "variations": [{"value": {"tcp_port": 443}}]},
-    }[key]
     mock_select_from_list.return_value = {"key": "flag2", "name": "Flag 2"}
 
     # Call the function
@@ -122,31 +106,76 @@ def test_select_flag(mock_select_from_list):
     # Assertions
     assert result == "flag2"
     client.get_feature_flags.assert_called_once_with("test-project")
-    mock_select_from_list.assert_called_once()
+    client.get_feature_flag.assert_not_called()
+    json_flags = mock_select_from_list.call_args[0][0]
+    assert [flag["key"] for flag in json_flags] == ["flag2"]
+
+
+@pytest.mark.parametrize(
+    "variations, expected",
+    [
+        ([{"value": True}, {"value": {"tcp_port": 443}}], True),
+        ([{"value": True}, {"value": False}], False),
+        ([{"value": [1, 2]}, {}], False),
+        ([], False),
+    ],
+)
+def test_has_json_variation(variations, expected):
+    """Test detecting flags with JSON object variations."""
+    assert has_json_variation({"variations": variations}) is expected
+    assert has_json_variation({}) is False
 
 
-@patch("ld_json_flag.interactive.os.unlink")
-@patch("ld_json_flag.interactive.subprocess.call")
-@patch("ld_json_flag.interactive.tempfile.NamedTemporaryFile")
-@patch("builtins.open")
 @patch("builtins.print")
-def test_edit_json_in_editor(
-    mock_print, mock_open, mock_tempfile, mock_subprocess, mock_unlink
-):
+def test_fetch_flag_details(mock_print, client):
+    """Test fetching flag details concurrently with a per-flag error."""
+    # Setup
+    flags = [{"key": f"flag{i}"} for i in range(30)]
+
+    def get_feature_flag(key, project_key):
+        if key == "flag3":
+            raise Exception("Not found")
+        return {"key": key, "project": project_key}
+
+    client.get_feature_flag.side_effect = get_feature_flag
+
+    # Call the function
+    result = fetch_flag_details(client, flags, "test-project")
+
+    # Assertions
+    assert client.get_feature_flag.call_count == 30
+    assert [flag["key"] for flag, _ in result] == [
+        f"flag{i}" for i in range(30) if i != 3
+    ]
+    assert all(details["key"] == flag["key"] for flag, details in result)
+    mock_print.assert_called_once_with("Error checking flag flag3: Not found")
+
+
+@pytest.fixture
+def mock_tempfile(mocker):
+    """Patch tempfile.mkstemp to hand out a fixed descriptor and path."""
+    return mocker.patch("tempfile.mkstemp", return_value=(3, "/tmp/test.json"))
+
+
+def test_edit_json_in_editor(mocker, mock_tempfile):
     """Test editing JSON in an editor."""
+    builtins = mocker.patch.multiple("builtins", open=DEFAULT, print=DEFAULT)
+    mock_open, mock_print = builtins["open"], builtins["print"]
+    mock_subprocess = mocker.patch("subprocess.run")
+    mock_unlink = mocker.patch("ld_json_flag.interactive.os.unlink")
+    mock_which = mocker.patch("shutil.which")
+
     # Setup
     json_data = [{"name": "Test", "value": {"tcp_port": 443}}]
 
-    # Mock the temporary file
-    mock_temp_file = MagicMock()
-    mock_temp_file.name = "/tmp/test.json"
-    mock_tempfile.return_value.__enter__.return_value = mock_temp_file
+    # Mock the editor lookup
+    mock_which.return_value = "/usr/bin/vim"
 
-    # Mock the file read after editing
+    # Mock the file write before editing and the read after editing
     mock_file_handle = MagicMock()
     mock_open.return_value.__enter__.return_value = mock_file_handle
     mock_file_handle.read.return_value = (
-        '[{"name": "Test", "value": {"tcp_port": 8080}}]'
+        b'[{"name": "Test", "value": {"tcp_port": 8080}}]'
     )
 
     # Call the function
@@ -154,23 +183,47 @@ def test_edit_json_in_editor(
 
     # Assertions
     assert result == [{"name": "Test", "value": {"tcp_port": 8080}}]
-    mock_subprocess.assert_called_once()
-    mock_open.assert_called_once_with("/tmp/test.json", "r")
+    mock_print.assert_called_once()
+    assert mock_print.call_args[0][0].startswith("\nINSTRUCTIONS:\n1. Edit")
+    mock_file_handle.write.assert_called_once_with(
+        b'[\n  {\n    "name": "Test",\n    "value": {\n      "tcp_port": 443\n    }\n  }\n]'
+    )
+    mock_subprocess.assert_called_once_with(
+        ["/usr/bin/vim", "/tmp/test.json"], close_fds=False
+    )
+    mock_tempfile.assert_called_once_with(suffix=".json")
+    assert mock_open.call_args_list == [call(3, "wb"), call("/tmp/test.json", "rb")]
     mock_unlink.assert_called_once_with("/tmp/test.json")
 
 
-@patch("ld_json_flag.interactive.os.unlink")
-@patch("ld_json_flag.interactive.input")
-@patch("ld_json_flag.interactive.select_project")
-@patch("ld_json_flag.interactive.select_flag")
-@patch("ld_json_flag.interactive.edit_json_in_editor")
-def test_interactive_workflow_create_flag(
-    mock_editor, mock_select_flag, mock_select_project, mock_input, mock_unlink
-):
-    """Test the interactive workflow for creating a flag."""
+def test_edit_json_in_editor_invalid_json(mocker, mock_tempfile):
+    """Test that invalid JSON from the editor is reported and discarded."""
+    builtins = mocker.patch.multiple("builtins", open=DEFAULT, print=DEFAULT)
+    mock_open, mock_print = builtins["open"], builtins["print"]
+    mocker.patch("subprocess.run")
+    mock_unlink = mocker.patch("ld_json_flag.interactive.os.unlink")
+
     # Setup
-    client = MagicMock()
-    client.project_key = None
+    mock_open.return_value.__enter__.return_value.read.return_value = b"[{"
+
+    # Call the function
+    result = edit_json_in_editor([])
+
+    # Assertions
+    assert result is None
+    assert any(
+        "Invalid JSON format" in str(args[0]) for args, _ in mock_print.call_args_list
+    )
+    mock_unlink.assert_called_once_with("/tmp/test.json")
+
+
+def test_interactive_workflow_create_flag(mocker, client):
+    """Test the interactive workflow for creating a flag."""
+    mock_editor = mocker.patch("ld_json_flag.interactive.edit_json_in_editor")
+    mocker.patch("ld_json_flag.interactive.select_flag")
+    mock_select_project = mocker.patch("ld_json_flag.interactive.select_project")
+    mock_input = mocker.patch("ld_json_flag.interactive.input")
+    mock_unlink = mocker.patch("ld_json_flag.interactive.os.unlink")
 
     # Mock user selections
     mock_select_project.return_value = "test-project"
@@ -193,128 +246,381 @@ def test_interactive_workflow_create_flag(
         {"name": "Development", "value": {"tcp_port": 8080}},
     ]
 
-    # Mock tempfile and create_flag_workflow
-    with patch(
-        "ld_json_flag.interactive.tempfile.NamedTemporaryFile"
-    ) as mock_tempfile, patch(
-        "ld_json_flag.interactive.create_flag_workflow"
-    ) as mock_create_workflow:
-
-        # Setup tempfile
-        mock_temp_file = MagicMock()
-        mock_temp_file.name = "/tmp/variations.json"
-        mock_tempfile.return_value.__enter__.return_value = mock_temp_file
-
-        # Setup create_flag_workflow
-        mock_create_workflow.return_value = True
+    # Mock create_flag_workflow
+    mock_create_workflow = mocker.patch(
+        "ld_json_flag.interactive.create_flag_workflow", return_value=True
+    )
 
-        # Call the function
-        result = interactive_workflow(client)
+    # Call the function
+    result = interactive_workflow(client)
 
     # Assertions
     assert result is True
     mock_select_project.assert_called_once_with(client)
     assert client.project_key == "test-project"
+    client.prefetch.assert_called_once_with("get_environments", "test-project")
     client.get_environments.assert_called_once_with("test-project")
     mock_editor.assert_called_once()
-    mock_create_workflow.assert_called_once()
-    mock_unlink.assert_called_once_with("/tmp/variations.json")
+    mock_create_workflow.assert_called_once_with(
+        client, "test-flag", "Test Flag", mock_editor.return_value, None, "test-project"
+    )
+    mock_unlink.assert_not_called()
 
 
-@patch("ld_json_flag.interactive.input")
-@patch("ld_json_flag.interactive.select_project")
-@patch("ld_json_flag.interactive.select_flag")
-@patch("ld_json_flag.interactive.update_flag_variations_workflow")
-def test_interactive_workflow_update_flag(
-    mock_update_workflow, mock_select_flag, mock_select_project, mock_input
-):
-    """Test the interactive workflow for updating a flag."""
+@patch("builtins.print")
+def test_create_flag_workflow_with_list(mock_print, client):
+    """Test creating a flag from variations that are already in memory."""
     # Setup
-    client = MagicMock()
-    client.project_key = None
+    variations = [{"name": "Production", "value": {"tcp_port": 443}}]
+
+    # Call the function
+    result = create_flag_workflow(
+        client, "test-flag", "Test Flag", variations, None, "test-project"
+    )
+
+    # Assertions
+    assert result is True
+    client.load_variations.assert_not_called()
+    client.create_feature_flag.assert_called_once_with(
+        "test-flag", "Test Flag", variations, "test-project"
+    )
 
-    # Mock user selections
-    mock_select_project.return_value = "test-project"
-    mock_input.return_value = "2"  # Update flag
 
-    # Mock update_flag_variations_workflow
-    mock_update_workflow.return_value = True
+@patch("builtins.print")
+def test_create_flag_workflow_with_dict(mock_print, client):
+    """Test that an edited JSON object is rejected rather than read as a path."""
+    # Setup
+    variations = {"name": "Production", "value": {"tcp_port": 443}}
 
     # Call the function
-    result = interactive_workflow(client)
+    result = create_flag_workflow(
+        client, "test-flag", "Test Flag", variations, None, "test-project"
+    )
 
     # Assertions
-    assert result is True
-    mock_select_project.assert_called_once_with(client)
-    assert client.project_key == "test-project"
-    mock_update_workflow.assert_called_once_with(client, "test-project")
+    assert result is False
+    client.load_variations.assert_not_called()
+    client.create_feature_flag.assert_not_called()
+    mock_print.assert_any_call("❌ Variations must be a JSON array")
+    mock_print.assert_any_call("❌ Some variations are invalid. Flag not created.")
 
 
-@patch("ld_json_flag.interactive.input")
-@patch("ld_json_flag.interactive.select_project")
-@patch("ld_json_flag.interactive.validate_flags_workflow")
-def test_interactive_workflow_validate_flags(
-    mock_validate_workflow, mock_select_project, mock_input
-):
-    """Test the interactive workflow for validating flags."""
+@patch("builtins.print")
+def test_create_flag_workflow_with_invalid_variation(mock_print, client):
+    """Test that edited variations are validated before the flag is created."""
     # Setup
-    client = MagicMock()
-    client.project_key = None
+    variations = [{"name": "Production", "value": {"tcp_port": "443"}}]
+    client.validate_tcp_port_json.side_effect = ValueError("tcp_port must be an int")
 
-    # Mock user selections
-    mock_select_project.return_value = "test-project"
-    mock_input.side_effect = ["3", "y"]  # Validate flags, fix invalid
+    # Call the function
+    result = create_flag_workflow(
+        client, "test-flag", "Test Flag", variations, None, "test-project"
+    )
+
+    # Assertions
+    assert result is False
+    client.create_feature_flag.assert_not_called()
+    mock_print.assert_any_call("❌ Variation 1 is invalid: tcp_port must be an int")
 
-    # Mock validate_flags_workflow
-    mock_validate_workflow.return_value = True
+
+@patch("builtins.print")
+def test_create_flag_workflow_malformed_file(mock_print, client, tmp_path):
+    """Test that a malformed variations file is reported as a load error."""
+    # Setup
+    path = tmp_path / "variations.json"
+    path.write_text('[{"name": "Production", "value": ')
+    client.load_variations.side_effect = LaunchDarklyClient.load_variations
 
     # Call the function
-    result = interactive_workflow(client)
+    result = create_flag_workflow(
+        client, "test-flag", "Test Flag", str(path), None, "test-project"
+    )
 
     # Assertions
-    assert result is True
-    mock_select_project.assert_called_once_with(client)
-    assert client.project_key == "test-project"
-    mock_validate_workflow.assert_called_once_with(client, True, "test-project")
+    assert result is False
+    client.create_feature_flag.assert_not_called()
+    assert mock_print.call_args[0][0].startswith(
+        "❌ Error loading variations from file: "
+    )
 
 
-@patch("ld_json_flag.interactive.input")
-@patch("ld_json_flag.interactive.select_project")
-def test_interactive_workflow_quit(mock_select_project, mock_input):
-    """Test quitting the interactive workflow."""
+@patch("builtins.print")
+def test_apply_env_rules(mock_print, tmp_path, client):
+    """Test configuring targeting rules for several environments."""
     # Setup
-    client = MagicMock()
-    client.project_key = None
+    rules = [{"variation": 0}]
+    for env in ("production", "staging", "development"):
+        (tmp_path / f"{env}.json").write_text('[{"variation": 0}]')
 
-    # Mock user selections
-    mock_select_project.return_value = "test-project"
-    mock_input.return_value = "q"  # Quit
+    def configure_environment_targeting(flag_key, env, targeting_rules, project_key):
+        if env == "staging":
+            raise Exception("Forbidden")
+
+    client.configure_environment_targeting.side_effect = configure_environment_targeting
 
     # Call the function
-    result = interactive_workflow(client)
+    apply_env_rules(
+        client,
+        "test-flag",
+        [
+            f"production:{tmp_path / 'production.json'}",
+            "no-separator",
+            f"staging:{tmp_path / 'staging.json'}",
+            f"development:{tmp_path / 'development.json'}",
+        ],
+        "test-project",
+    )
 
     # Assertions
-    assert result is False
-    mock_select_project.assert_called_once_with(client)
-    assert client.project_key == "test-project"
+    assert client.configure_environment_targeting.call_count == 3
+    client.configure_environment_targeting.assert_any_call(
+        "test-flag", "production", rules, "test-project"
+    )
+    client.configure_environment_targeting.assert_any_call(
+        "test-flag", "development", rules, "test-project"
+    )
+    assert mock_print.call_args_list == [
+        call("❌ Invalid format for environment rules: no-separator"),
+        call("Format should be 'environment:path.json'"),
+        call("❌ Error configuring environment 'staging': Forbidden"),
+    ]
+
+
+@patch("builtins.print")
+def test_apply_flag_updates(mock_print, client):
+    """Test updating several flags concurrently with ordered reporting."""
+    # Setup
+    threads = set()
+
+    def update_flag_variations(flag_key, variations, project_key):
+        threads.add(threading.current_thread())
+        if flag_key == "flag2":
+            raise Exception("Forbidden")
+
+    client.update_flag_variations.side_effect = update_flag_variations
+    updates = [(f"flag{i}", [{"value": {"tcp_port": i}}]) for i in (1, 2, 3)]
+
+    # Call the function
+    apply_flag_updates(client, updates, "test-project")
+
+    # Assertions
+    assert client.update_flag_variations.call_count == 3
+    client.update_flag_variations.assert_any_call(
+        "flag3", [{"value": {"tcp_port": 3}}], "test-project"
+    )
+    assert threading.main_thread() not in threads
+    assert mock_print.call_args_list == [
+        call("✅ Successfully updated variations for flag 'flag1'"),
+        call("❌ Error updating flag variations: Forbidden"),
+        call("✅ Successfully updated variations for flag 'flag3'"),
+    ]
+
+
+@patch("builtins.print")
+def test_apply_flag_updates_groups_client_output(mock_print):
+    """Test that each flag's client messages print together, in flag order."""
+    # Setup
+    client = LaunchDarklyClient("fake-key", "test-project")
+    started = threading.Barrier(2)
+
+    def update_flag_variations(flag_key, variations, project_key):
+        started.wait(5)
+        client._print(f"Updating {flag_key}")
+        if flag_key == "flag1":
+            time.sleep(0.05)
+        client._print(f"Updated {flag_key}")
+
+    # Call the function
+    with patch.object(client, "update_flag_variations", update_flag_variations):
+        apply_flag_updates(client, [("flag1", []), ("flag2", [])], "test-project")
+
+    # Assertions
+    assert mock_print.call_args_list == [
+        call("Updating flag1"),
+        call("Updated flag1"),
+        call("✅ Successfully updated variations for flag 'flag1'"),
+        call("Updating flag2"),
+        call("Updated flag2"),
+        call("✅ Successfully updated variations for flag 'flag2'"),
+    ]
+
+
+@patch("builtins.print")
+def test_apply_flag_updates_single(mock_print, client):
+    """Test that a single update is sent without a thread pool."""
+    # Call the function
+    with patch("concurrent.futures.ThreadPoolExecutor") as mock_executor:
+        apply_flag_updates(client, [("flag1", [])], "test-project")
+
+    # Assertions
+    mock_executor.assert_not_called()
+    client.update_flag_variations.assert_called_once_with("flag1", [], "test-project")
+    mock_print.assert_called_once_with(
+        "✅ Successfully updated variations for flag 'flag1'"
+    )
+
+
+def test_format_variations():
+    """Test formatting a numbered variations preview."""
+    variations = [
+        {"name": "Production", "value": {"tcp_port": 443}},
+        {"name": "Development", "value": {"tcp_port": 8080}},
+    ]
+
+    assert format_variations(variations) == (
+        '1. Production: {"tcp_port":443}\n2. Development: {"tcp_port":8080}'
+    )
+
+
+def test_preview_value():
+    """Test that long values are cut off in previews."""
+    value = {"tcp_port": 443, "hosts": [f"host-{i}" for i in range(100)]}
 
+    assert preview_value({"tcp_port": 443}) == '{"tcp_port":443}'
+    assert preview_value(value, limit=20) == '{"tcp_port":443,"hos…'
+    assert len(preview_value(value)) == 201
+
+
+def test_find_invalid_variations():
+    """Test checking edited variations locally."""
+    # Setup
+    from ld_json_flag.client import LaunchDarklyClient
+
+    client = LaunchDarklyClient("fake-key", "test-project")
+
+    # Valid variations
+    assert find_invalid_variations(client, [{"value": {"tcp_port": 443}}]) == []
+
+    # Invalid variations are reported by index
+    assert find_invalid_variations(
+        client,
+        [{"value": {"tcp_port": 443}}, {"value": {"tcp_port": 70000}}, "oops"],
+    ) == [
+        (1, "tcp_port must be between 0 and 65535"),
+        (2, "Variation must be an object"),
+    ]
+
+    # Anything other than an array is rejected as a whole
+    assert find_invalid_variations(client, {"value": {"tcp_port": 443}}) == [
+        (None, "Variations must be a JSON array")
+    ]
+
+
+def test_update_flag_variations_workflow(mocker, client):
+    """Test updating flag variations after previewing them."""
+    mock_print = mocker.patch("builtins.print")
+    mock_select_flag = mocker.patch("ld_json_flag.interactive.select_flag")
+    mock_editor = mocker.patch("ld_json_flag.interactive.edit_json_in_editor")
+    mock_input = mocker.patch("ld_json_flag.interactive.input")
 
-@patch("ld_json_flag.interactive.input")
-@patch("ld_json_flag.interactive.select_project")
-def test_interactive_workflow_invalid_choice(mock_select_project, mock_input):
-    """Test entering an invalid choice in the interactive workflow."""
     # Setup
-    client = MagicMock()
-    client.project_key = None
+    client.get_feature_flag.return_value = {
+        "variations": [
+            {"name": "Production", "value": {"tcp_port": 443}},
+            {"name": "Development", "value": {"tcp_port": 8080}},
+        ]
+    }
+    edited = [{"name": "Production", "value": {"tcp_port": 8443}}]
+    mock_select_flag.return_value = "test-flag"
+    mock_editor.return_value = edited
+    mock_input.return_value = "y"
 
+    # Call the function
+    result = update_flag_variations_workflow(client, "test-project")
+
+    # Assertions
+    assert result is True
+    printed = {c.args[0] for c in mock_print.call_args_list if c.args}
+    assert (
+        "\nCurrent variations:\n"
+        '1. Production: {"tcp_port":443}\n'
+        '2. Development: {"tcp_port":8080}'
+    ) in printed
+    assert '\nUpdated variations:\n1. Production: {"tcp_port":8443}' in printed
+    client.update_flag_variations.assert_called_once_with(
+        "test-flag", edited, "test-project"
+    )
+
+
+def test_update_flag_variations_workflow_invalid_edit(mocker, client):
+    """Test that invalid edits are rejected before prompting or updating."""
+    mock_print = mocker.patch("builtins.print")
+    mock_select_flag = mocker.patch("ld_json_flag.interactive.select_flag")
+    mock_editor = mocker.patch("ld_json_flag.interactive.edit_json_in_editor")
+    mock_input = mocker.patch("ld_json_flag.interactive.input")
+
+    # Setup
+    client.get_feature_flag.return_value = {
+        "variations": [{"name": "Production", "value": {"tcp_port": 443}}]
+    }
+    client.validate_tcp_port_json.side_effect = ValueError(
+        "tcp_port must be an integer"
+    )
+    mock_select_flag.return_value = "test-flag"
+    mock_editor.return_value = [{"name": "Production", "value": {"tcp_port": "443"}}]
+
+    # Call the function
+    result = update_flag_variations_workflow(client, "test-project")
+
+    # Assertions
+    assert result is False
+    mock_input.assert_not_called()
+    client.update_flag_variations.assert_not_called()
+    mock_print.assert_any_call("❌ Variation 1 is invalid: tcp_port must be an integer")
+
+
+def test_build_template_variations():
+    """Test building the editor template for a new flag."""
+    # One variation per environment, with the production port for prod keys
+    assert build_template_variations(
+        [{"key": "production", "name": "Production"}, {"key": "qa", "name": "QA"}]
+    ) == [
+        {
+            "name": "Production",
+            "description": "Production configuration",
+            "value": {"tcp_port": 443},
+        },
+        {"name": "QA", "description": "QA configuration", "value": {"tcp_port": 8080}},
+    ]
+
+    # Default template without environments
+    assert [v["name"] for v in build_template_variations([])] == [
+        "Production",
+        "Development",
+    ]
+
+
+@pytest.mark.parametrize(
+    "inputs, workflow, workflow_args, expected",
+    [
+        (["2"], "update_flag_variations_workflow", ("test-project",), True),
+        (["3", "y"], "validate_flags_workflow", (True, "test-project"), True),
+        (["q"], None, None, False),
+        (["4", "q"], None, None, False),
+    ],
+    ids=["update_flag", "validate_flags", "quit", "invalid_choice"],
+)
+def test_interactive_workflow_menu(
+    mocker, client, inputs, workflow, workflow_args, expected
+):
+    """Test dispatching menu choices from the interactive workflow."""
     # Mock user selections
-    mock_select_project.return_value = "test-project"
-    mock_input.side_effect = ["4", "q"]  # Invalid choice, then quit
+    mock_select_project = mocker.patch(
+        "ld_json_flag.interactive.select_project", return_value="test-project"
+    )
+    mocker.patch("ld_json_flag.interactive.input", side_effect=inputs)
+    if workflow:
+        mock_workflow = mocker.patch(
+            f"ld_json_flag.interactive.{workflow}", return_value=True
+        )
 
     # Call the function
     result = interactive_workflow(client)
 
     # Assertions
-    assert result is False
+    assert result is expected
     mock_select_project.assert_called_once_with(client)
     assert client.project_key == "test-project"
+    if workflow:
+        mock_workflow.assert_called_once_with(client, *workflow_args)
+    client.prefetch.assert_not_called()
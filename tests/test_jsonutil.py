@@ -0,0 +1,74 @@
+"""Tests for the JSON helpers."""
+
+import json
+import pytest
+from ld_json_flag import jsonutil
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    """Run each test with orjson (when installed) and with the json fallback."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(jsonutil, "orjson", None)
+    return request.param
+
+
+def test_dumps(backend):
+    """Test compact serialization."""
+    data = {"name": "Production", "value": {"tcp_port": 443}}
+
+    # Call the function
+    result = jsonutil.dumps(data)
+
+    # Assertions
+    assert isinstance(result, bytes)
+    assert b"\n" not in result
+    assert json.loads(result) == data
+
+
+def test_dumps_indent(backend):
+    """Test pretty-printed serialization."""
+    data = [{"name": "Production", "value": {"tcp_port": 443}}]
+
+    # Call the function
+    result = jsonutil.dumps(data, indent=True)
+
+    # Assertions
+    assert result == json.dumps(data, indent=2).encode()
+
+
+def test_loads(backend):
+    """Test deserializing bytes and text."""
+    # Call the function
+    from_bytes = jsonutil.loads(b'{"tcp_port": 443}')
+    from_text = jsonutil.loads('{"tcp_port": 443}')
+
+    # Assertions
+    assert from_bytes == from_text == {"tcp_port": 443}
+
+
+def test_loads_invalid(backend):
+    """Test that invalid JSON raises the standard decode error."""
+    with pytest.raises(json.JSONDecodeError):
+        jsonutil.loads(b"{not json")
+
+
+def test_check_file_size(tmp_path, monkeypatch):
+    """Test rejecting JSON files over the size limit."""
+    # Setup
+    monkeypatch.setattr(jsonutil, "MAX_FILE_SIZE", 16)
+    small = tmp_path / "small.json"
+    small.write_text('{"tcp_port": 1}')
+    large = tmp_path / "large.json"
+    large.write_text('{"tcp_port": 443}')
+
+    # Within the limit
+    with open(small, "rb") as f:
+        jsonutil.check_file_size(f)
+
+    # Over the limit
+    with open(large, "rb") as f:
+        with pytest.raises(ValueError, match="is too large"):
+            jsonutil.check_file_size(f)
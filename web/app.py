@@ -127,6 +127,9 @@ async def connect(request: Request):
     # Update the client with the provided key
     flag_client.api_key = api_key
     flag_client.headers = {"Authorization": api_key, "Content-Type": "application/json"}
+    flag_client.session.headers.update(flag_client.headers)
+    # Results cached under the previous key belong to another account
+    flag_client.clear_cache()
 
     # Try to load projects
     try: